@@ -6,27 +6,44 @@ from decimal import Decimal
 from coinbase_agentkit.action_providers import ActionProvider, create_action
 from coinbase_agentkit.wallet_providers import EvmWalletProvider
 from pydantic import BaseModel, Field
+from requests import RequestException
+from web3.exceptions import ContractLogicError
 
+# web3 v6 gives its exceptions a common base; the pinned v5 has none to catch
+try:
+    from web3.exceptions import Web3Exception
+except ImportError:
+    class Web3Exception(Exception):
+        pass
+
+from dcagent.utils.blockchain import TimeExhausted
 from dcagent.utils.aerodrome import (
     add_liquidity, 
     stake_lp_tokens_in_gauge,
-    claim_rewards,
-    get_staked_lp_balance,
-    get_earned_rewards
+    claim_rewards
 )
+from dcagent.utils.multicall import get_yield_snapshot
 
 logger = logging.getLogger(__name__)
 
+# LP tokens have 18 decimals
+_WAD = 10**18
+
+# Failures an action reports back to the caller; anything else is a bug and propagates.
+# pydantic's ValidationError is a ValueError, so bad arguments are covered too, and
+# TimeExhausted covers a transaction that wasn't mined in time.
+_ACTION_ERRORS = (ValueError, ContractLogicError, RequestException, TimeExhausted, Web3Exception)
+
 # Schema definitions
 class AddLiquiditySchema(BaseModel):
     """Schema for adding liquidity to Aerodrome"""
-    cbbtc_amount: str = Field(..., description="Amount of cbBTC to provide")
-    usdc_amount: str = Field(..., description="Amount of USDC to provide")
-    slippage: float = Field(0.01, description="Maximum slippage (default 1%)")
+    cbbtc_amount: Decimal = Field(..., gt=0, description="Amount of cbBTC to provide")
+    usdc_amount: Decimal = Field(..., gt=0, description="Amount of USDC to provide")
+    slippage: float = Field(0.01, ge=0, le=0.5, description="Maximum slippage (default 1%)")
 
 class StakeLPSchema(BaseModel):
     """Schema for staking LP tokens"""
-    lp_amount: str = Field(..., description="Amount of LP tokens to stake")
+    lp_amount: Decimal = Field(..., gt=0, description="Amount of LP tokens to stake")
 
 class AerodromeActionProvider(ActionProvider[EvmWalletProvider]):
     """Action provider for Aerodrome Finance"""
@@ -43,17 +60,15 @@ class AerodromeActionProvider(ActionProvider[EvmWalletProvider]):
     )
     def add_liquidity_action(self, wallet_provider: EvmWalletProvider, args: Dict[str, Any]) -> str:
         try:
-            cbbtc_amount = Decimal(args["cbbtc_amount"])
-            usdc_amount = Decimal(args["usdc_amount"])
-            slippage = float(args.get("slippage", 0.01))
+            params = AddLiquiditySchema.model_validate(args)
             
-            result = add_liquidity(cbbtc_amount, usdc_amount, slippage)
+            result = add_liquidity(params.cbbtc_amount, params.usdc_amount, params.slippage)
             
             if not result:
                 return "Failed to add liquidity"
             
-            return f"Successfully added liquidity: {cbbtc_amount} cbBTC and {usdc_amount} USDC"
-        except Exception as e:
+            return f"Successfully added liquidity: {params.cbbtc_amount} cbBTC and {params.usdc_amount} USDC"
+        except _ACTION_ERRORS as e:
             return f"Error adding liquidity: {e}"
     
     @create_action(
@@ -65,7 +80,8 @@ class AerodromeActionProvider(ActionProvider[EvmWalletProvider]):
     )
     def stake_lp_action(self, wallet_provider: EvmWalletProvider, args: Dict[str, Any]) -> str:
         try:
-            lp_amount = int(Decimal(args["lp_amount"]) * (10**18))  # LP tokens have 18 decimals
+            params = StakeLPSchema.model_validate(args)
+            lp_amount = int(params.lp_amount * _WAD)
             
             tx_hash = stake_lp_tokens_in_gauge(lp_amount)
             
@@ -73,7 +89,7 @@ class AerodromeActionProvider(ActionProvider[EvmWalletProvider]):
                 return "Failed to stake LP tokens"
             
             return f"Successfully staked LP tokens. Transaction hash: {tx_hash}"
-        except Exception as e:
+        except _ACTION_ERRORS as e:
             return f"Error staking LP tokens: {e}"
     
     @create_action(
@@ -90,7 +106,7 @@ class AerodromeActionProvider(ActionProvider[EvmWalletProvider]):
                 return "Failed to claim rewards"
             
             return f"Successfully claimed rewards. Transaction hash: {tx_hash}"
-        except Exception as e:
+        except _ACTION_ERRORS as e:
             return f"Error claiming rewards: {e}"
     
     @create_action(
@@ -100,18 +116,22 @@ class AerodromeActionProvider(ActionProvider[EvmWalletProvider]):
         """
     )
     def get_yield_info_action(self, wallet_provider: EvmWalletProvider, args: Dict[str, Any]) -> str:
-        try:
-            staked_balance = get_staked_lp_balance()
-            earned_rewards = get_earned_rewards()
-            
-            return (
-                f"Your Aerodrome Yield Position:\n"
-                f"- Staked LP tokens: {staked_balance:.6f}\n"
-                f"- Earned AERO rewards: {earned_rewards:.6f}\n"
-            )
-        except Exception as e:
-            return f"Error getting yield information: {e}"
+        # Both gauge reads go out as one Multicall3 eth_call; a failed read comes back
+        # as zeros rather than raising
+        snapshot = get_yield_snapshot()
+        
+        return (
+            f"Your Aerodrome Yield Position:\n"
+            f"- Staked LP tokens: {snapshot.staked:.6f}\n"
+            f"- Earned AERO rewards: {snapshot.earned:.6f}\n"
+        )
+
+# Shared instance so repeated calls don't rebuild the action metadata and schemas
+_PROVIDER_SINGLETON: Optional[AerodromeActionProvider] = None
 
 def aerodrome_action_provider() -> AerodromeActionProvider:
-    """Create a new Aerodrome action provider"""
-    return AerodromeActionProvider()
\ No newline at end of file
+    """Get the Aerodrome action provider, creating it on first use"""
+    global _PROVIDER_SINGLETON
+    if _PROVIDER_SINGLETON is None:
+        _PROVIDER_SINGLETON = AerodromeActionProvider()
+    return _PROVIDER_SINGLETON
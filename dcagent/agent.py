@@ -1,5 +1,9 @@
-import time
+import asyncio
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from typing import List, Optional
 from coinbase_agentkit import AgentKit
 
@@ -9,6 +13,7 @@ from dcagent.strategies.dca_strategy import DCAStrategy
 from dcagent.strategies.dip_strategy import DipBuyingStrategy
 from dcagent.strategies.yield_strategy import YieldOptimizationStrategy
 from dcagent.utils.agent_kit import initialize_agent_kit
+from dcagent.utils.timer_wheel import TimerWheel
 from dcagent.action_providers.aerodrome_provider import aerodrome_action_provider
 
 logger = logging.getLogger(__name__)
@@ -22,7 +27,14 @@ class DCAgent:
         self.strategies: List[BaseStrategy] = []
         self.running = False
         self.initialized = False
+        # Set by stop(); checked before the loop starts so an early stop is not lost
+        self._stop_requested = threading.Event()
         self.agent_kit: Optional[AgentKit] = None
+        self._wake_event: Optional[asyncio.Event] = None
+        self._wheel: Optional[TimerWheel] = None
+        self._execute_lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
     
     def initialize(self) -> bool:
         """Initialize the agent and its strategies"""
@@ -41,8 +53,8 @@ class DCAgent:
             self.agent_kit.add_action_provider(aerodrome_action_provider())
             
             logger.info("AgentKit initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize AgentKit: {e}")
+        except Exception:
+            logger.exception("Failed to initialize AgentKit")
             return False
         
         # Initialize strategies
@@ -56,28 +68,125 @@ class DCAgent:
         logger.info("DCAgent initialization complete")
         return True
     
-    def run(self):
-        """Run the agent main loop"""
+    def run_once(self) -> None:
+        """
+        Run a single sweep over the strategies and return
+        
+        Nothing carries over between runs, so the OS timer is the only schedule. An
+        AI-advised DCA skip can't push the next buy back a day; the buy simply waits
+        for the next timer firing. Strategies that need state built up in-process
+        (dip detection's price history) are skipped.
+        """
+        strategies = []
+        for strategy in self.strategies:
+            if strategy.supports_run_once:
+                strategies.append(strategy)
+            else:
+                logger.info("Skipping %s strategy, which needs a resident agent", strategy.name)
+        
+        now = datetime.now()
+        for strategy in strategies:
+            # The OS timer that launched this sweep is the schedule, so interval strategies are due now
+            if strategy.next_execution is not None:
+                strategy.next_execution = now
+        
+        # Check every strategy at once, then execute the ready ones in turn since they share the wallet nonce
+        ready = list(self._pool.map(lambda strategy: strategy.should_execute(), strategies))
+        for strategy, should_execute in zip(strategies, ready):
+            # A SIGTERM from the service manager lands here between strategies
+            if self._stop_requested.is_set():
+                logger.info("Stop requested, skipping the remaining strategies")
+                return
+            if should_execute:
+                strategy.execute()
+    
+    async def _run_due(self, strategy: BaseStrategy) -> None:
+        """Check and possibly execute one due strategy, then put it back on the wheel"""
+        try:
+            # Checks run concurrently, so one slow RPC doesn't hold up the other strategies
+            if await self._loop.run_in_executor(self._pool, strategy.should_execute):
+                # Executions share the wallet nonce, so send them one at a time
+                async with self._execute_lock:
+                    await self._loop.run_in_executor(self._pool, strategy.execute)
+        except Exception:
+            logger.exception("Error running %s strategy", strategy.name)
+        
+        # A deadline that is still in the past (e.g. a failed execution) is retried after one poll interval
+        retry_at = time.monotonic() + strategy.poll_interval
+        self._wheel.schedule(max(strategy.next_deadline(), retry_at), strategy)
+        self._wake_event.set()
+    
+    async def _run_strategies(self) -> None:
+        """Sleep until the earliest strategy deadline and dispatch whatever is due"""
+        self._loop = asyncio.get_running_loop()
+        self._wake_event = asyncio.Event()
+        self._execute_lock = asyncio.Lock()
+        # Deadlines are on the monotonic clock, the one strategies check them against
+        self._wheel = TimerWheel()
+        for strategy in self.strategies:
+            self._wheel.schedule(strategy.next_deadline(), strategy)
+        
+        in_flight = set()
+        while not self._stop_requested.is_set():
+            for strategy in self._wheel.poll(time.monotonic()):
+                task = asyncio.create_task(self._run_due(strategy))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+            
+            # Woken early by stop() or when a finished strategy reschedules itself
+            next_deadline = self._wheel.next_deadline()
+            timeout = None if next_deadline is None else max(next_deadline - time.monotonic(), 0)
+            try:
+                await asyncio.wait_for(self._wake_event.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._wake_event.clear()
+        
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
+    
+    def stop(self) -> None:
+        """Ask the main loop to exit without waiting out the current interval; safe from any thread"""
+        self._stop_requested.set()
+        self.running = False
+        if self._loop is not None and self._wake_event is not None:
+            self._loop.call_soon_threadsafe(self._wake_event.set)
+    
+    def run(self, run_once: bool = False) -> bool:
+        """
+        Run the agent main loop
+        
+        Args:
+            run_once: Do a single sweep and exit, for systemd/launchd timer driven deployments
+            
+        Returns:
+            bool: False if the agent failed to initialize or the loop errored
+        """
         if not self.initialized and not self.initialize():
             logger.error("Failed to initialize agent")
-            return
+            return False
         
         self.running = True
+        # One worker per strategy so their network-bound checks overlap instead of queueing
+        self._pool = ThreadPoolExecutor(max_workers=max(len(self.strategies), 1), thread_name_prefix="strategy")
         logger.info("DCAgent started")
         
         try:
-            while self.running:
-                for strategy in self.strategies:
-                    if strategy.should_execute():
-                        strategy.execute()
-                
-                # Sleep to avoid excessive CPU usage
-                time.sleep(60)  # Check every minute
+            if run_once:
+                if not self._stop_requested.is_set():
+                    self.run_once()
+                return True
+            
+            if not self._stop_requested.is_set():
+                asyncio.run(self._run_strategies())
         
         except KeyboardInterrupt:
             logger.info("Agent stopped by user")
-        except Exception as e:
-            logger.error(f"Error in agent main loop: {e}")
+        except Exception:
+            logger.exception("Error in agent main loop")
+            return False
         finally:
             self.running = False
-            logger.info("DCAgent stopped")
\ No newline at end of file
+            self._pool.shutdown(wait=False)
+            logger.info("DCAgent stopped")
+        return True
\ No newline at end of file
@@ -1,13 +1,59 @@
-import os
+import logging
 from dotenv import load_dotenv
-from typing import Literal
+from typing import Any, Literal, Optional
+from pydantic import field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+logger = logging.getLogger(__name__)
+
+DCA_INTERVALS = ("daily", "weekly", "monthly")
 
 # Load environment variables
 load_dotenv()
 
+class Settings(BaseSettings):
+    """Agent settings, parsed and validated from the environment once at import"""
+
+    model_config = SettingsConfigDict(frozen=True, extra="ignore")
+
+    # Network Configuration
+    base_rpc_url: str = "https://mainnet.base.org"
+    base_chain_id: int = 8453
+
+    # Agent Configuration
+    dca_amount: float = 50  # Default $50
+    dca_interval: Literal["daily", "weekly", "monthly"] = "weekly"
+    enable_dip_buying: bool = True
+    dip_threshold: float = 5  # Default 5%
+
+    # Wallet Configuration
+    private_key: Optional[str] = None
+
+    # Aerodrome Configuration
+    aerodrome_router: str = "0xcF77a3Ba9A5CA399B7c97c74d54e5b1Beb874E43"
+    cbbtc_pool: str = "0x4e962BB3889Bf030368F56810A9c96B83CB3E778"  # Need to find the actual pool
+    cbbtc_gauge: str = "0x6399ed6725cC163D019aA64FF55b22149D7179A8"  # Need to find the actual gauge
+    enable_yield_optimization: bool = True
+    reinvest_yield: bool = True
+
+    # AI Configuration
+    anthropic_api_key: Optional[str] = None
+    enable_ai_advisor: bool = True
+
+    @field_validator("dca_interval", mode="before")
+    @classmethod
+    def _fallback_dca_interval(cls, value: Any) -> Any:
+        """Fall back to daily on an unknown interval, as the agent always has, instead of refusing to start"""
+        if value not in DCA_INTERVALS:
+            logger.warning(f"Invalid DCA interval: {value}, defaulting to daily")
+            return "daily"
+        return value
+
+settings = Settings()
+
 # Network Configuration
-BASE_RPC_URL = os.getenv("BASE_RPC_URL", "https://mainnet.base.org")
-BASE_CHAIN_ID = int(os.getenv("BASE_CHAIN_ID", "8453"))
+BASE_RPC_URL = settings.base_rpc_url
+BASE_CHAIN_ID = settings.base_chain_id
 
 # Token Configuration
 CBBTC_CONTRACT_ADDRESS = "0xcbB7C0000aB88B473b1f5aFd9ef808440eed33Bf"  # Base Mainnet cbBTC address
@@ -17,39 +63,37 @@ USDC_CONTRACT_ADDRESS = "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913"  # Base Mai
 PYTH_BTC_PRICE_FEED = "0xe62df6c8b4a85fe1a67db44dc12de5db330f7ac66b72dc658afedf0f4a415b43"  # BTC/USD price feed ID
 
 # Agent Configuration
-DCA_AMOUNT = float(os.getenv("DCA_AMOUNT", "50"))  # Default $50
-DCA_INTERVAL: Literal["daily", "weekly", "monthly"] = os.getenv("DCA_INTERVAL", "weekly")  # type: ignore
-ENABLE_DIP_BUYING = os.getenv("ENABLE_DIP_BUYING", "true").lower() == "true"
-DIP_THRESHOLD = float(os.getenv("DIP_THRESHOLD", "5"))  # Default 5%
+DCA_AMOUNT = settings.dca_amount
+DCA_INTERVAL = settings.dca_interval
+ENABLE_DIP_BUYING = settings.enable_dip_buying
+DIP_THRESHOLD = settings.dip_threshold
 
 # Wallet Configuration
-PRIVATE_KEY = os.getenv("PRIVATE_KEY")
+PRIVATE_KEY = settings.private_key
 
 # Aerodrome Configuration
-AERODROME_ROUTER = os.getenv("AERODROME_ROUTER", "0xcF77a3Ba9A5CA399B7c97c74d54e5b1Beb874E43")
-CBBTC_POOL = os.getenv("CBBTC_POOL", "0x4e962BB3889Bf030368F56810A9c96B83CB3E778")  # Need to find the actual pool
-CBBTC_GAUGE = os.getenv("CBBTC_GAUGE", "0x6399ed6725cC163D019aA64FF55b22149D7179A8")  # Need to find the actual gauge
-ENABLE_YIELD_OPTIMIZATION = os.getenv("ENABLE_YIELD_OPTIMIZATION", "true").lower() == "true"
-REINVEST_YIELD = os.getenv("REINVEST_YIELD", "true").lower() == "true"
+AERODROME_ROUTER = settings.aerodrome_router
+CBBTC_POOL = settings.cbbtc_pool
+CBBTC_GAUGE = settings.cbbtc_gauge
+ENABLE_YIELD_OPTIMIZATION = settings.enable_yield_optimization
+REINVEST_YIELD = settings.reinvest_yield
 
 # AI Configuration
-ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
-ENABLE_AI_ADVISOR = os.getenv("ENABLE_AI_ADVISOR", "true").lower() == "true"
+ANTHROPIC_API_KEY = settings.anthropic_api_key
+ENABLE_AI_ADVISOR = settings.enable_ai_advisor
 
 def validate_config() -> bool:
     """Validate that all required configuration is present"""
-    required_vars = [
-        "BASE_RPC_URL",
-        "PRIVATE_KEY",
-    ]
-    
-    for var in required_vars:
-        if not globals().get(var):
-            print(f"Missing required configuration: {var}")
-            return False
-    
+    # Types and allowed values were already checked when settings was built
+    if not settings.base_rpc_url:
+        print("Missing required configuration: BASE_RPC_URL")
+        return False
+    if not settings.private_key:
+        print("Missing required configuration: PRIVATE_KEY")
+        return False
+
     # Warn if AI advisor is enabled but API key is missing
-    if ENABLE_AI_ADVISOR and not ANTHROPIC_API_KEY:
+    if settings.enable_ai_advisor and not settings.anthropic_api_key:
         print("WARNING: AI advisor is enabled but ANTHROPIC_API_KEY is missing. AI features will not work.")
-    
-    return True
\ No newline at end of file
+
+    return True
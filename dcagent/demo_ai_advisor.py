@@ -24,11 +24,24 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
-# Import after logging setup to capture all logs
 # Check for demo mode flag
 DEMO_MODE = os.environ.get("DEMO_MODE", "false").lower() == "true"
 
-if not DEMO_MODE:
+def main():
+    """Demo script to show Claude AI integration"""
+    
+    if DEMO_MODE:
+        # Use simulated data in demo mode
+        run_demo_mode()
+    else:
+        # Use actual Claude API in regular mode
+        run_live_mode()
+    
+    print("\n✅ Demo completed successfully!")
+
+def run_live_mode():
+    """Run the demo with live Claude API"""
+    # Imported here so demo mode never pays for anthropic and the web3 stack
     try:
         import anthropic
     except ImportError:
@@ -44,21 +57,7 @@ if not DEMO_MODE:
         print(f"ERROR: Failed to import required modules: {e}")
         print("Run in demo mode to see simulated output: DEMO_MODE=true ./run_ai_demo.sh")
         sys.exit(1)
-
-def main():
-    """Demo script to show Claude AI integration"""
-    
-    if DEMO_MODE:
-        # Use simulated data in demo mode
-        run_demo_mode()
-    else:
-        # Use actual Claude API in regular mode
-        run_live_mode()
     
-    print("\n✅ Demo completed successfully!")
-
-def run_live_mode():
-    """Run the demo with live Claude API"""
     # Initialize Claude Advisor
     print("\n🤖 Initializing Claude AI Advisor...")
     advisor = ClaudeAdvisor()
@@ -1,4 +1,6 @@
+import argparse
 import logging
+import signal
 import sys
 from dcagent.agent import DCAgent
 
@@ -14,8 +16,19 @@ logging.basicConfig(
 
 def main():
     """Entry point for the DC Agent application"""
+    parser = argparse.ArgumentParser(description="Autonomous Bitcoin DCA Agent")
+    parser.add_argument(
+        "--once",
+        action="store_true",
+        help="run a single strategy sweep and exit (for systemd/launchd timers)"
+    )
+    args = parser.parse_args()
+    
     agent = DCAgent()
-    agent.run()
+    # systemd and launchd stop services with SIGTERM; wake the loop and exit cleanly
+    signal.signal(signal.SIGTERM, lambda signum, frame: agent.stop())
+    ok = agent.run(run_once=args.once)
+    sys.exit(0 if ok else 1)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
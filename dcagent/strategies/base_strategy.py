@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 from datetime import datetime
+from typing import Optional
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -9,6 +11,13 @@ class BaseStrategy(ABC):
     Base class for all strategies used by DCAgent
     """
     
+    # Minimum seconds between should_execute() checks in the agent loop
+    poll_interval: float = 60
+    
+    # Whether a one-shot --once run can act on this strategy. Strategies that build up
+    # state across polls of one resident process opt out.
+    supports_run_once: bool = True
+    
     def __init__(self, name: str):
         self.name = name
         self.initialized = False
@@ -16,6 +25,30 @@ class BaseStrategy(ABC):
         self.next_execution = None
         logger.info(f"Initializing {name} strategy")
     
+    @property
+    def next_execution(self) -> Optional[datetime]:
+        """Wall-clock time of the next scheduled execution, if any"""
+        return self._next_execution
+    
+    @next_execution.setter
+    def next_execution(self, when: Optional[datetime]) -> None:
+        self._next_execution = when
+        # Pin the deadline to the monotonic clock once so is_due() is a float compare
+        # that wall-clock adjustments can't move
+        if when is None:
+            self._next_fire_monotonic = None
+        else:
+            self._next_fire_monotonic = time.monotonic() + (when - datetime.now()).total_seconds()
+    
+    def is_due(self) -> bool:
+        """
+        Check whether next_execution has been reached
+        
+        Returns:
+            bool: True once the scheduled time has passed, False if nothing is scheduled
+        """
+        return self._next_fire_monotonic is not None and time.monotonic() >= self._next_fire_monotonic
+    
     @abstractmethod
     def should_execute(self) -> bool:
         """
@@ -36,6 +69,20 @@ class BaseStrategy(ABC):
         """
         pass
     
+    def next_deadline(self) -> float:
+        """
+        When the agent should next call should_execute(), on the time.monotonic() clock
+        
+        The agent's timer wheel runs on the same clock as is_due(), so a wall-clock
+        step (suspend, NTP) can't wake it before anything is due.
+        
+        Returns:
+            float: next_execution's monotonic deadline if scheduled, otherwise one poll interval from now
+        """
+        if self._next_fire_monotonic is not None:
+            return self._next_fire_monotonic
+        return time.monotonic() + self.poll_interval
+    
     def log_execution(self, success: bool):
         """
         Log the execution result
@@ -1,28 +1,24 @@
 import logging
-import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
-import json
 import os
+from decimal import Decimal
+
+from dateutil.relativedelta import relativedelta
 
 from dcagent.config import (
     DCA_AMOUNT, 
     DCA_INTERVAL, 
     CBBTC_CONTRACT_ADDRESS, 
-    USDC_CONTRACT_ADDRESS,
-    AERODROME_ROUTER
+    USDC_CONTRACT_ADDRESS
 )
 from dcagent.strategies.base_strategy import BaseStrategy
-from dcagent.utils.blockchain import (
-    get_account, 
-    get_token_balance, 
-    approve_token_spending, 
-    get_contract,
-    web3,
-    send_contract_transaction
-)
-from dcagent.utils.pyth_utils import get_btc_price
-from dcagent.utils.logging_utils import log_event, log_transaction
+from dcagent.utils.blockchain import get_account, get_token_balance
+from dcagent.utils.pyth_utils import get_price_quote
+from dcagent.utils.multicall import get_allowance_snapshot_and_nonce
+from dcagent.utils.logging_utils import log_event, log_transaction, read_events_newest_first
+from dcagent.utils.swap import ROUTER_ADDRESS, ApprovalFailed, USDC_SCALE, CBBTC_SCALE, USDC_AMOUNT_WEI, BPS, min_cbbtc_out, received_cbbtc, swap_usdc_to_cbbtc
 from dcagent.utils.claude_advisor import ClaudeAdvisor
 from dcagent.utils.gas_utils import GasOptimizer
 
@@ -30,15 +26,24 @@ logger = logging.getLogger(__name__)
 
 # Get directory of this file to construct paths correctly
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EVENTS_FILE = os.path.join(os.path.dirname(BASE_DIR), "events.json")
+
+# The swap's slippage bound is never tighter than the volatile pool's fee plus a margin
+# for the spread between the oracle price and the pool, or amountOutMin is unreachable
+POOL_FEE = Decimal("0.003")  # Aerodrome volatile pools charge 0.3%
+SLIPPAGE_MARGIN = Decimal("0.002")
+MIN_SLIPPAGE = POOL_FEE + SLIPPAGE_MARGIN
+# Width of the price confidence interval, in sigmas, treated as normal price movement
+CONFIDENCE_SIGMAS = 3
 
-# Load Router ABI
-def load_abi(filename):
-    """Load ABI from a JSON file"""
-    abi_path = os.path.join(BASE_DIR, 'abis', filename)
-    with open(abi_path, 'r') as f:
-        return json.load(f)
+# How long to wait, once the swap is done, for the AI insight that goes in the completion event
+INSIGHT_TIMEOUT = 5  # seconds
 
-ROUTER_ABI = load_abi('router.json')
+def _is_transaction(event: Dict[str, Any], tx_type: Optional[str]) -> bool:
+    """Whether an event is a transaction, of tx_type if given"""
+    if event.get("type") != "transaction":
+        return False
+    return not tx_type or event.get("data", {}).get("type") == tx_type
 
 def get_recent_transactions(count: int, tx_type: str = None) -> List[Dict[str, Any]]:
     """
@@ -52,26 +57,19 @@ def get_recent_transactions(count: int, tx_type: str = None) -> List[Dict[str, A
         List of recent transaction dictionaries
     """
     try:
-        events_file = os.path.join(os.path.dirname(BASE_DIR), "events.json")
-        if not os.path.exists(events_file):
-            return []
-            
-        with open(events_file, 'r') as f:
-            events = json.load(f)
-        
-        # Filter for transaction events
-        tx_events = [e for e in events if e.get("type") == "transaction"]
-        
-        # Additional filter by tx_type if specified
-        if tx_type:
-            tx_events = [e for e in tx_events if e.get("data", {}).get("type") == tx_type]
-            
-        # Get the most recent ones
-        recent_txs = tx_events[-count:] if tx_events else []
+        # Walk back from the newest event and stop once enough matches are found
+        matches = []
+        for tx in read_events_newest_first(EVENTS_FILE):
+            if len(matches) >= count:
+                break
+            if _is_transaction(tx, tx_type):
+                matches.append(tx)
+        # Oldest first, as before
+        matches.reverse()
         
         # Format them for AI consumption
         formatted_txs = []
-        for tx in recent_txs:
+        for tx in matches:
             data = tx.get("data", {})
             details = data.get("details", {})
             formatted_txs.append({
@@ -82,9 +80,8 @@ def get_recent_transactions(count: int, tx_type: str = None) -> List[Dict[str, A
                 "btc_price": details.get("btc_price", 0),
                 "usdc_amount": details.get("usdc_amount", 0),
             })
-            
         return formatted_txs
-        
+    
     except Exception as e:
         logger.error(f"Error getting recent transactions: {e}")
         return []
@@ -100,10 +97,18 @@ class DCAStrategy(BaseStrategy):
         self.claude_advisor = ClaudeAdvisor()  # Initialize Claude Advisor
         self.gas_optimizer = GasOptimizer()    # Initialize Gas Optimizer
         self.price_history = []                # Track price history
+        # The AI insight is only logged, so it is generated here while the swap runs
+        self._ai_pool = ThreadPoolExecutor(max_workers=1)
     
-    def setup_next_execution(self):
-        """Set up the next execution time based on the DCA interval"""
-        now = datetime.now()
+    def setup_next_execution(self, now: Optional[datetime] = None):
+        """
+        Set up the next execution time based on the DCA interval
+        
+        Args:
+            now: Time to schedule from (defaults to the current time)
+        """
+        if now is None:
+            now = datetime.now()
         
         if DCA_INTERVAL == "daily":
             # Execute at the same time every day
@@ -111,56 +116,50 @@ class DCAStrategy(BaseStrategy):
         elif DCA_INTERVAL == "weekly":
             # Execute on the same day of week
             self.next_execution = now + timedelta(days=7)
-        elif DCA_INTERVAL == "monthly":
-            # Execute on the same day of month if possible
-            current_day = now.day
-            next_month = now.replace(day=1) + timedelta(days=32)
-            last_day_of_next_month = (next_month.replace(day=1) - timedelta(days=1)).day
-            next_day = min(current_day, last_day_of_next_month)
-            self.next_execution = next_month.replace(day=next_day)
         else:
-            # Default to daily if interval is invalid
-            logger.warning(f"Invalid DCA interval: {DCA_INTERVAL}, defaulting to daily")
-            self.next_execution = now + timedelta(days=1)
+            # Monthly: the same day of month, clamped to the last day of a shorter month.
+            # An invalid interval was already replaced by daily when the config loaded.
+            self.next_execution = now + relativedelta(months=1)
     
     def should_execute(self) -> bool:
         """Determine if the strategy should execute now"""
-        now = datetime.now()
-        return now >= self.next_execution
+        return self.is_due()
     
     def execute(self) -> bool:
         """Execute the DCA strategy by buying BTC with AI advisor"""
         logger.info("Executing AI-enhanced DCA Strategy")
         
         try:
-            # Get the current BTC price
-            btc_price = get_btc_price()
-            if not btc_price:
+            # The price and the wallet reads are independent, so fetch them together. The
+            # USDC balance/allowance (one Multicall3 eth_call) and the pending nonce share
+            # one JSON-RPC batch; executions hold the agent's lock, so the nonce can't go stale
+            account = get_account()
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                price_future = pool.submit(get_price_quote)
+                wallet_future = pool.submit(get_allowance_snapshot_and_nonce, USDC_CONTRACT_ADDRESS, account.address, ROUTER_ADDRESS)
+                quote = price_future.result()
+                usdc, nonce = wallet_future.result()
+            usdc_balance = usdc.balance / USDC_SCALE
+            
+            if not quote:
                 logger.error("Failed to get BTC price, aborting DCA execution")
                 return False
+            btc_price = quote.price
             
             # Update price history
             self.price_history.append(btc_price)
             if len(self.price_history) > 24:  # Keep 24 hours of history
                 self.price_history = self.price_history[-24:]
             
-            logger.info(f"Current BTC price: ${btc_price:,.2f}")
+            logger.info("Current BTC price: $%.2f", btc_price)
             
             # Get market analysis from Claude
             analysis = self.claude_advisor.market_analysis(btc_price, self.price_history)
-            logger.info(f"AI Market Analysis: {analysis['sentiment']} sentiment, buy opportunity: {analysis['buy_opportunity']}")
-            
-            # Generate insight for logging
-            insight = self.claude_advisor.generate_insight(
-                "DCA", 
-                get_recent_transactions(5, "DCA Buy"),
-                {"current_price": btc_price, "price_history": self.price_history[-10:]}
-            )
-            logger.info(f"AI Insight: {insight}")
+            logger.info("AI Market Analysis: %s sentiment, buy opportunity: %s", analysis['sentiment'], analysis['buy_opportunity'])
             
             # Decide whether to proceed with DCA based on AI recommendation
             if not analysis['buy_opportunity']:
-                logger.info(f"AI advises skipping this DCA cycle: {analysis['reasoning']}")
+                logger.info("AI advises skipping this DCA cycle: %s", analysis['reasoning'])
                 # Log the skipped event with reasoning
                 log_event("dca_execution", {
                     "strategy": "dca",
@@ -176,93 +175,60 @@ class DCAStrategy(BaseStrategy):
                 
             # AI recommends proceeding with buy - calculate the amount of BTC to buy
             btc_amount = DCA_AMOUNT / btc_price
-            logger.info(f"AI recommends proceeding with buying {btc_amount:.8f} BTC (${DCA_AMOUNT:.2f})")
+            logger.info("AI recommends proceeding with buying %.8f BTC ($%.2f)", btc_amount, DCA_AMOUNT)
             
             # Check if we have enough USDC
-            account = get_account()
-            usdc_balance = get_token_balance(USDC_CONTRACT_ADDRESS, account.address)
-            
-            if usdc_balance < DCA_AMOUNT:
-                logger.error(f"Insufficient USDC balance. Have: ${usdc_balance:.2f}, Need: ${DCA_AMOUNT:.2f}")
+            if usdc.balance < USDC_AMOUNT_WEI:
+                logger.error("Insufficient USDC balance. Have: $%.2f, Need: $%.2f", usdc_balance, DCA_AMOUNT)
                 return False
             
             # Implement actual swap from USDC to cbBTC
             
-            # 1. Convert amounts to wei considering token decimals
-            usdc_decimals = 6  # USDC has 6 decimals
-            usdc_amount_wei = int(DCA_AMOUNT * (10**usdc_decimals))
-            
-            # 2. Calculate minimum amount out with AI-recommended slippage
-            slippage = analysis["slippage_recommendation"] / 100  # Convert from percentage
-            min_btc_amount = btc_amount * (1 - slippage)
-            cbbtc_decimals = 18  # cbBTC has 18 decimals (like most ERC20 tokens)
-            min_btc_amount_wei = int(min_btc_amount * (10**cbbtc_decimals))
-            
-            logger.info(f"Using AI-recommended slippage: {slippage*100:.2f}%")
-            
-            # 3. Approve the router to spend USDC
-            logger.info(f"Approving Aerodrome Router to spend {DCA_AMOUNT} USDC")
-            approve_receipt = approve_token_spending(
-                USDC_CONTRACT_ADDRESS, 
-                AERODROME_ROUTER,
-                DCA_AMOUNT
+            # 1. Calculate minimum amount out with AI-recommended slippage. Only Pyth publishes a
+            # measured confidence interval, so only its quotes tighten that to a few sigmas;
+            # Coinbase's confidence is a fixed placeholder that measures nothing
+            ai_slippage = Decimal(str(analysis["slippage_recommendation"])) / 100  # Convert from percentage
+            slippage = ai_slippage
+            if quote.source == "pyth":
+                volatility_slippage = CONFIDENCE_SIGMAS * Decimal(str(quote.confidence)) / Decimal(str(btc_price))
+                slippage = min(slippage, volatility_slippage)
+            slippage = max(MIN_SLIPPAGE, slippage)
+            # Integer math from here on, so float rounding can't land amountOutMin above the quote
+            min_btc_amount_wei = min_cbbtc_out(USDC_AMOUNT_WEI, btc_price, int(slippage * BPS))
+            
+            logger.info("Using slippage: %.2f%% (AI recommended %.2f%%)", slippage * 100, ai_slippage * 100)
+            
+            logger.info("Executing swap: %s USDC -> ~%.8f cbBTC", DCA_AMOUNT, btc_amount)
+            
+            # 2. Approve the router if its allowance runs short, then swap through Aerodrome.
+            # The nonce read with the balances is counted up locally for the second transaction.
+            fees = self.gas_optimizer.get_optimized_fees("dca", DCA_AMOUNT)
+            
+            # Generate insight for logging in the background while the swap confirms. Submitted
+            # only now, past every early return, so a cycle that never swaps never pays for it.
+            insight_future = self._ai_pool.submit(
+                self.claude_advisor.generate_insight,
+                "DCA",
+                get_recent_transactions(5, "DCA Buy"),
+                {"current_price": btc_price, "price_history": self.price_history[-10:]}
             )
-            
-            if not approve_receipt or approve_receipt.status != 1:
-                logger.error("Failed to approve USDC spending")
+            try:
+                receipt = swap_usdc_to_cbbtc(account, USDC_AMOUNT_WEI, min_btc_amount_wei, usdc.allowance, nonce, fees)
+            except ApprovalFailed as e:
+                logger.error("DCA buy failed: %s", e)
                 return False
-            
-            logger.info(f"USDC spending approved. Transaction hash: {approve_receipt.transactionHash.hex()}")
-            
-            # 4. Execute the swap through Aerodrome Router
-            router_contract = get_contract(AERODROME_ROUTER, ROUTER_ABI)
-            
-            # Create swap transaction
-            # Set deadline to 10 minutes from now
-            deadline = int(time.time() + 600)
-            
-            logger.info(f"Executing swap: {DCA_AMOUNT} USDC -> ~{btc_amount:.8f} cbBTC")
-            
-            # Create the route for the swap
-            routes = [{
-                "from": USDC_CONTRACT_ADDRESS,           # tokenIn
-                "to": CBBTC_CONTRACT_ADDRESS,            # tokenOut
-                "stable": False,                         # volatile pair
-                "factory": web3.to_checksum_address("0xAAA20D08e59F6561f242b08513D36266C5A29415")  # Aerodrome factory
-            }]
-            
-            # Execute the swap with retry logic
-            swap_function = router_contract.functions.swapExactTokensForTokens(
-                usdc_amount_wei,                          # amountIn
-                min_btc_amount_wei,                       # amountOutMin
-                routes,                                   # routes array
-                account.address,                          # to
-                deadline                                  # deadline
-            )
-            
-            logger.info(f"Executing AI-enhanced swap with retry: {DCA_AMOUNT} USDC -> ~{btc_amount:.8f} cbBTC")
-            
-            # Use our retry-enabled transaction sender with AI gas optimization
-            optimized_gas_price = self.gas_optimizer.get_optimized_gas_price("dca", DCA_AMOUNT)
-            
-            receipt = send_contract_transaction(
-                contract_function=swap_function,
-                account=account,
-                gas_limit=300000,  # Set appropriate gas limit
-                max_retries=3,
-                gas_price=optimized_gas_price
-            )
-            
-            if not receipt or receipt.status != 1:
-                logger.error(f"Swap transaction failed. Receipt: {receipt}")
+            if receipt is None:
                 return False
             
             tx_hash = receipt.transactionHash.hex()
-            logger.info(f"Swap successful! Transaction hash: {tx_hash}")
+            logger.info("Swap successful! Transaction hash: %s", tx_hash)
             
-            # Get new cbBTC balance to confirm the swap worked
-            new_cbbtc_balance = get_token_balance(CBBTC_CONTRACT_ADDRESS, account.address)
-            logger.info(f"New cbBTC balance: {new_cbbtc_balance}")
+            # The cbBTC paid out is in the receipt's Transfer log; only query the balance if it isn't
+            received = received_cbbtc(receipt, account.address)
+            if received is not None:
+                logger.info("Received %.8f cbBTC", received / CBBTC_SCALE)
+            else:
+                logger.info("New cbBTC balance: %s", get_token_balance(CBBTC_CONTRACT_ADDRESS, account.address))
             
             # Log the transaction for the dashboard
             log_transaction(
@@ -281,11 +247,20 @@ class DCAStrategy(BaseStrategy):
             )
             
             # Update the execution time for next run
-            self.last_execution = datetime.now()
-            self.setup_next_execution()
-            logger.info(f"Next AI-enhanced DCA execution scheduled for: {self.next_execution}")
+            # Schedule from the completion time itself so next_execution is exactly one interval later
+            completion_time = datetime.now()
+            self.last_execution = completion_time
+            self.setup_next_execution(completion_time)
+            logger.info("Next AI-enhanced DCA execution scheduled for: %s", self.next_execution)
+            
+            # Log the completion event with AI insights, without the insight if it isn't ready
+            try:
+                insight = insight_future.result(timeout=INSIGHT_TIMEOUT)
+                logger.info("AI Insight: %s", insight)
+            except FutureTimeoutError:
+                insight = None
+                logger.warning("AI insight not ready after %ss, logging without it", INSIGHT_TIMEOUT)
             
-            # Log the completion event with AI insights
             log_event("dca_execution", {
                 "strategy": "dca",
                 "amount": DCA_AMOUNT,
@@ -300,6 +275,6 @@ class DCAStrategy(BaseStrategy):
             
             return True
             
-        except Exception as e:
-            logger.error(f"Error executing AI-enhanced DCA strategy: {e}")
+        except Exception:
+            logger.exception("Error executing AI-enhanced DCA strategy")
             return False
\ No newline at end of file
@@ -1,78 +1,100 @@
 import logging
 import time
-import json
-import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Optional
+
+import numpy as np
 
 from dcagent.config import (
     DCA_AMOUNT, 
     DIP_THRESHOLD, 
     ENABLE_DIP_BUYING, 
     CBBTC_CONTRACT_ADDRESS, 
-    USDC_CONTRACT_ADDRESS,
-    AERODROME_ROUTER
+    USDC_CONTRACT_ADDRESS
 )
 from dcagent.strategies.base_strategy import BaseStrategy
-from dcagent.utils.blockchain import (
-    get_account, 
-    get_token_balance, 
-    approve_token_spending,
-    get_contract,
-    web3,
-    send_contract_transaction
-)
+from dcagent.utils.blockchain import get_account, get_token_balance
 from dcagent.utils.pyth_utils import get_btc_price
 from dcagent.utils.logging_utils import log_event, log_transaction
+from dcagent.utils.multicall import get_allowance_snapshot_and_nonce
+from dcagent.utils.swap import ROUTER_ADDRESS, ApprovalFailed, USDC_SCALE, CBBTC_SCALE, USDC_AMOUNT_WEI, min_cbbtc_out, received_cbbtc, swap_usdc_to_cbbtc
 
 logger = logging.getLogger(__name__)
 
-# Get directory of this file to construct paths correctly
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-
-# Load Router ABI
-def load_abi(filename):
-    """Load ABI from a JSON file"""
-    abi_path = os.path.join(BASE_DIR, 'abis', filename)
-    with open(abi_path, 'r') as f:
-        return json.load(f)
+# Hourly price points kept for dip detection (24 hours)
+PRICE_HISTORY_SIZE = 24
+# Number of prices before the current one averaged as the dip baseline
+DIP_WINDOW = 6
 
-ROUTER_ABI = load_abi('router.json')
+# For dip buying, we use a slightly higher slippage to ensure execution
+DIP_SLIPPAGE_BPS = 100  # 1%
+# Re-sign a rejected or stuck dip buy more often, and with bigger fee bumps, than a DCA buy
+DIP_MAX_RETRIES = 4
+DIP_GAS_PRICE_BUMP_PERCENT = 15
 
 class DipBuyingStrategy(BaseStrategy):
     """
     Strategy for buying BTC during price dips
     """
     
+    # A dip is measured against the price history this process has recorded, which
+    # a fresh --once run starts without
+    supports_run_once = False
+    
     def __init__(self):
         super().__init__("DipBuying")
-        self.price_history: List[float] = []
+        # Ring buffer of hourly prices; price_count is the total ever recorded
+        self.price_history = np.empty(PRICE_HISTORY_SIZE, dtype=np.float64)
+        self.price_count = 0
+        # Running sum of the newest DIP_WINDOW + 1 prices (baseline window plus the current price)
+        self._window_sum = 0.0
+        # Drop below the baseline, in percent, at the last dip check
+        self.last_dip_percentage = 0.0
         self.check_interval = timedelta(hours=1)  # Check for dips hourly
         self.next_check = datetime.now()
         self.last_buy = None
         self.minimum_buy_interval = timedelta(days=1)  # Don't buy dips more than once per day
+        # Monotonic twins of next_check and last_buy, so polling is a float compare
+        self._next_check_monotonic = time.monotonic()
+        self._last_buy_monotonic: Optional[float] = None
     
     def update_price_history(self) -> None:
         """Update the price history with the current BTC price"""
         current_price = get_btc_price()
         if current_price:
-            self.price_history.append(current_price)
-            # Keep only the last 24 price points (24 hours of data at hourly intervals)
-            self.price_history = self.price_history[-24:]
+            # Slide the window: drop the price falling out of it, add the new one
+            if self.price_count > DIP_WINDOW:
+                evicted = self.price_count - DIP_WINDOW - 1
+                self._window_sum -= float(self.price_history[evicted % PRICE_HISTORY_SIZE])
+            self._window_sum += current_price
+            
+            # Overwrite the oldest slot once the 24 hours are full
+            self.price_history[self.price_count % PRICE_HISTORY_SIZE] = current_price
+            self.price_count += 1
+    
+    def _in_cooldown(self) -> bool:
+        """Whether the last dip buy was less than minimum_buy_interval ago"""
+        return (
+            self._last_buy_monotonic is not None
+            and time.monotonic() - self._last_buy_monotonic < self.minimum_buy_interval.total_seconds()
+        )
     
     def detect_dip(self) -> bool:
         """Detect if there's a significant price dip"""
-        if len(self.price_history) < 6:  # Need at least 6 hours of data
+        if self.price_count < DIP_WINDOW:  # Need at least 6 hours of data
             return False
         
         # Get current price
-        current_price = self.price_history[-1]
+        head = self.price_count - 1
+        current_price = float(self.price_history[head % PRICE_HISTORY_SIZE])
         
         # Calculate moving average (last 6 hours excluding current price)
-        moving_avg = sum(self.price_history[-7:-1]) / 6
+        moving_avg = (self._window_sum - current_price) / min(DIP_WINDOW, head)
         
         # Calculate percentage drop from moving average
         percentage_drop = (moving_avg - current_price) / moving_avg * 100
+        self.last_dip_percentage = percentage_drop
         
         # Check if drop exceeds threshold
         is_dip = percentage_drop >= DIP_THRESHOLD
@@ -81,8 +103,7 @@ class DipBuyingStrategy(BaseStrategy):
             logger.info(f"BTC price dip detected! {percentage_drop:.2f}% below 6-hour average")
             
             # Check if we're in the cooldown period
-            now = datetime.now()
-            in_cooldown = self.last_buy and (now - self.last_buy) < self.minimum_buy_interval
+            in_cooldown = self._in_cooldown()
             
             # Log the dip detection event
             log_event("dip_detected", {
@@ -98,34 +119,44 @@ class DipBuyingStrategy(BaseStrategy):
         
         return is_dip
     
+    def next_deadline(self) -> float:
+        """Dips are only looked for at each price check"""
+        return self._next_check_monotonic
+    
     def should_execute(self) -> bool:
         """Determine if the strategy should execute now"""
         if not ENABLE_DIP_BUYING:
             return False
-            
-        now = datetime.now()
         
         # Time to check for a dip?
-        if now >= self.next_check:
-            self.update_price_history()
-            self.next_check = now + self.check_interval
-            
-            # If we recently bought a dip, don't buy again yet
-            if self.last_buy and (now - self.last_buy) < self.minimum_buy_interval:
-                return False
-                
-            # Detect if there's a dip
-            return self.detect_dip()
-            
-        return False
+        if time.monotonic() < self._next_check_monotonic:
+            return False
+        
+        self._next_check_monotonic = time.monotonic() + self.check_interval.total_seconds()
+        self.next_check = datetime.now() + self.check_interval
+        self.update_price_history()
+        
+        # If we recently bought a dip, don't buy again yet
+        if self._in_cooldown():
+            return False
+        
+        # Detect if there's a dip
+        return self.detect_dip()
     
     def execute(self) -> bool:
         """Execute the dip buying strategy"""
         logger.info("Executing Dip Buying Strategy")
         
         try:
-            # Get the current BTC price
-            btc_price = get_btc_price()
+            # The price and the wallet reads are independent, so fetch them together. The
+            # USDC balance/allowance and the pending nonce come back in one JSON-RPC batch
+            account = get_account()
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                price_future = pool.submit(get_btc_price)
+                wallet_future = pool.submit(get_allowance_snapshot_and_nonce, USDC_CONTRACT_ADDRESS, account.address, ROUTER_ADDRESS)
+                btc_price = price_future.result()
+                usdc, nonce = wallet_future.result()
+            
             if not btc_price:
                 logger.error("Failed to get BTC price, aborting dip buy execution")
                 return False
@@ -137,88 +168,43 @@ class DipBuyingStrategy(BaseStrategy):
             logger.info(f"Attempting to buy {btc_amount:.8f} BTC (${DCA_AMOUNT:.2f}) during dip")
             
             # Check if we have enough USDC
-            account = get_account()
-            usdc_balance = get_token_balance(USDC_CONTRACT_ADDRESS, account.address)
+            usdc_balance = usdc.balance / USDC_SCALE
             
-            if usdc_balance < DCA_AMOUNT:
+            if usdc.balance < USDC_AMOUNT_WEI:
                 logger.error(f"Insufficient USDC balance. Have: ${usdc_balance:.2f}, Need: ${DCA_AMOUNT:.2f}")
                 return False
             
-            # Implement actual swap from USDC to cbBTC
-            
-            # 1. Convert amounts to wei considering token decimals
-            usdc_decimals = 6  # USDC has 6 decimals
-            usdc_amount_wei = int(DCA_AMOUNT * (10**usdc_decimals))
-            
-            # 2. Calculate minimum amount out with 0.5% slippage
-            # For dip buying, we can use a slightly higher slippage to ensure execution
-            slippage = 0.01  # 1% slippage for dip buying to ensure execution
-            min_btc_amount = btc_amount * (1 - slippage)
-            cbbtc_decimals = 18  # cbBTC has 18 decimals (like most ERC20 tokens)
-            min_btc_amount_wei = int(min_btc_amount * (10**cbbtc_decimals))
-            
-            # 3. Approve the router to spend USDC
-            logger.info(f"Approving Aerodrome Router to spend {DCA_AMOUNT} USDC for dip buying")
-            approve_receipt = approve_token_spending(
-                USDC_CONTRACT_ADDRESS, 
-                AERODROME_ROUTER,
-                DCA_AMOUNT
-            )
-            
-            if not approve_receipt or approve_receipt.status != 1:
-                logger.error("Failed to approve USDC spending")
-                return False
-            
-            logger.info(f"USDC spending approved. Transaction hash: {approve_receipt.transactionHash.hex()}")
-            
-            # 4. Execute the swap through Aerodrome Router
-            router_contract = get_contract(AERODROME_ROUTER, ROUTER_ABI)
-            
-            # Create swap transaction
-            # Set deadline to 10 minutes from now
-            deadline = int(time.time() + 600)
+            min_btc_amount_wei = min_cbbtc_out(USDC_AMOUNT_WEI, btc_price, DIP_SLIPPAGE_BPS)
             
             logger.info(f"Executing dip buy swap: {DCA_AMOUNT} USDC -> ~{btc_amount:.8f} cbBTC at ${btc_price:,.2f}")
             
-            # Create the route for the swap
-            routes = [{
-                "from": USDC_CONTRACT_ADDRESS,           # tokenIn
-                "to": CBBTC_CONTRACT_ADDRESS,            # tokenOut
-                "stable": False,                         # volatile pair
-                "factory": web3.to_checksum_address("0xAAA20D08e59F6561f242b08513D36266C5A29415")  # Aerodrome factory
-            }]
-            
-            # Execute the swap with retry logic
-            swap_function = router_contract.functions.swapExactTokensForTokens(
-                usdc_amount_wei,                          # amountIn
-                min_btc_amount_wei,                       # amountOutMin
-                routes,                                   # routes array
-                account.address,                          # to
-                deadline                                  # deadline
-            )
-            
-            logger.info(f"Executing dip buy swap with retry: {DCA_AMOUNT} USDC -> ~{btc_amount:.8f} cbBTC")
-            
-            # Use our retry-enabled transaction sender
-            # For dip buying, we use more retries (4) to ensure we catch the dip
-            receipt = send_contract_transaction(
-                contract_function=swap_function,
-                account=account,
-                gas_limit=300000,  # Set appropriate gas limit
-                max_retries=4,
-                gas_price_bump_percent=15  # Higher gas price bump for dip buys
-            )
-            
-            if not receipt or receipt.status != 1:
-                logger.error(f"Dip buy swap transaction failed. Receipt: {receipt}")
+            # For dip buying, we use more retries (4) and a higher gas price bump to ensure we catch the dip
+            try:
+                receipt = swap_usdc_to_cbbtc(
+                    account,
+                    USDC_AMOUNT_WEI,
+                    min_btc_amount_wei,
+                    usdc.allowance,
+                    nonce,
+                    max_retries=DIP_MAX_RETRIES,
+                    gas_price_bump_percent=DIP_GAS_PRICE_BUMP_PERCENT
+                )
+            except ApprovalFailed as e:
+                logger.error(f"Dip buy failed: {e}")
+                return False
+            if receipt is None:
+                logger.error("Dip buy swap failed")
                 return False
             
             tx_hash = receipt.transactionHash.hex()
             logger.info(f"Dip buy swap successful! Transaction hash: {tx_hash}")
             
-            # Get new cbBTC balance to confirm the swap worked
-            new_cbbtc_balance = get_token_balance(CBBTC_CONTRACT_ADDRESS, account.address)
-            logger.info(f"New cbBTC balance after dip buy: {new_cbbtc_balance}")
+            # The cbBTC paid out is in the receipt's Transfer log; only query the balance if it isn't
+            received = received_cbbtc(receipt, account.address)
+            if received is not None:
+                logger.info(f"Received {received / CBBTC_SCALE:.8f} cbBTC in dip buy")
+            else:
+                logger.info(f"New cbBTC balance after dip buy: {get_token_balance(CBBTC_CONTRACT_ADDRESS, account.address)}")
             
             # Log the transaction for the dashboard
             log_transaction(
@@ -230,13 +216,14 @@ class DipBuyingStrategy(BaseStrategy):
                     "strategy": "dip",
                     "usdc_amount": DCA_AMOUNT,
                     "btc_price": btc_price,
-                    "dip_percentage": percentage_drop,
+                    "dip_percentage": self.last_dip_percentage,
                     "timestamp": datetime.now().isoformat()
                 }
             )
             
             # Record this buy
             self.last_buy = datetime.now()
+            self._last_buy_monotonic = time.monotonic()
             self.last_execution = self.last_buy
             logger.info(f"Dip buying recorded. Next dip buy will be available after: {self.last_buy + self.minimum_buy_interval}")
             
@@ -246,7 +233,7 @@ class DipBuyingStrategy(BaseStrategy):
                 "amount": DCA_AMOUNT,
                 "btc_price": btc_price,
                 "btc_amount": btc_amount,
-                "dip_percentage": percentage_drop,
+                "dip_percentage": self.last_dip_percentage,
                 "next_available": (self.last_buy + self.minimum_buy_interval).isoformat(),
                 "status": "bought"
             })
@@ -1,4 +1,5 @@
 import logging
+import time
 from datetime import datetime, timedelta
 from decimal import Decimal
 
@@ -33,6 +34,11 @@ class YieldOptimizationStrategy(BaseStrategy):
         self.claim_interval = timedelta(days=7)  # Claim rewards weekly
         self.next_claim = datetime.now()
     
+    def next_deadline(self) -> float:
+        """The earlier of the next yield check and the next reward claim"""
+        # These are checked against the wall clock, so convert afresh each time the agent asks
+        return time.monotonic() + (min(self.next_check, self.next_claim) - datetime.now()).total_seconds()
+    
     def should_execute(self) -> bool:
         """Determine if the strategy should execute now"""
         if not ENABLE_YIELD_OPTIMIZATION:
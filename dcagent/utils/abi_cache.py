@@ -0,0 +1,27 @@
+import functools
+import os
+
+# Prefer the faster orjson parser for ABI files when it is installed
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# Directory holding the bundled contract ABIs
+ABI_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'abis')
+
+@functools.lru_cache(maxsize=None)
+def load_abi(filename: str):
+    """
+    Load a contract ABI from dcagent/abis, parsing each file once per process
+
+    The parsed ABI is shared between callers, so treat it as read-only.
+
+    Args:
+        filename: ABI file name, e.g. 'router.json'
+
+    Returns:
+        The ABI as a list of entries
+    """
+    with open(os.path.join(ABI_DIR, filename), 'rb') as f:
+        return json_loads(f.read())
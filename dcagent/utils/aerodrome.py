@@ -1,6 +1,4 @@
-import json
 import logging
-import os
 import time
 from typing import Optional, Tuple, Dict, Any
 from decimal import Decimal
@@ -10,20 +8,12 @@ from web3 import Web3
 from dcagent.config import CBBTC_CONTRACT_ADDRESS, USDC_CONTRACT_ADDRESS, AERODROME_ROUTER as ROUTER_ADDRESS
 from dcagent.config import CBBTC_POOL as POOL_ADDRESS, CBBTC_GAUGE as GAUGE_ADDRESS
 from dcagent.utils.agent_kit import get_token_balance
-from dcagent.utils.blockchain import web3, get_account, get_contract, approve_token_spending, send_contract_transaction
+from dcagent.utils.abi_cache import load_abi
+from dcagent.utils.blockchain import web3, get_account, get_contract, approve_token_spending, send_contract_transaction, wait_for_receipt
+from dcagent.utils.swap import router_contract as get_router_contract
 
 logger = logging.getLogger(__name__)
 
-# Get directory of this file to construct paths correctly
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-
-# Load ABIs from files
-def load_abi(filename):
-    """Load ABI from a JSON file"""
-    abi_path = os.path.join(BASE_DIR, 'abis', filename)
-    with open(abi_path, 'r') as f:
-        return json.load(f)
-
 # Load ABIs
 POOL_ABI = load_abi('pool.json')
 GAUGE_ABI = load_abi('gauge.json')
@@ -48,7 +38,7 @@ def add_liquidity(cbbtc_amount: Decimal, usdc_amount: Decimal, slippage: float =
     """
     try:
         account = get_account()
-        router_contract = get_contract(ROUTER_ADDRESS, ROUTER_ABI)
+        router_contract = get_router_contract()
         
         # Convert amounts to wei
         cbbtc_amount_wei = int(cbbtc_amount * (10**CBBTC_DECIMALS))
@@ -99,9 +89,6 @@ def add_liquidity(cbbtc_amount: Decimal, usdc_amount: Decimal, slippage: float =
         
         logger.info(f"Adding liquidity: {cbbtc_amount} cbBTC and {usdc_amount} USDC")
         
-        # Define the factory address for Aerodrome
-        factory_address = web3.to_checksum_address("0xAAA20D08e59F6561f242b08513D36266C5A29415")
-        
         # Create the function call for adding liquidity
         add_liquidity_fn = router_contract.functions.addLiquidity(
             CBBTC_CONTRACT_ADDRESS,                # tokenA
@@ -187,7 +174,7 @@ def stake_lp_tokens_in_gauge(lp_amount: int) -> Optional[str]:
         approve_tx_hash = web3.eth.send_raw_transaction(signed_tx.rawTransaction)
         
         # Wait for approval transaction receipt
-        approve_receipt = web3.eth.wait_for_transaction_receipt(approve_tx_hash)
+        approve_receipt = wait_for_receipt(approve_tx_hash)
         
         if approve_receipt.status != 1:
             logger.error("Failed to approve LP token spending")
@@ -210,7 +197,7 @@ def stake_lp_tokens_in_gauge(lp_amount: int) -> Optional[str]:
         tx_hash = web3.eth.send_raw_transaction(signed_tx.rawTransaction)
         
         # Wait for transaction receipt
-        receipt = web3.eth.wait_for_transaction_receipt(tx_hash)
+        receipt = wait_for_receipt(tx_hash)
         
         if receipt.status != 1:
             logger.error(f"Stake transaction failed. Transaction hash: {tx_hash.hex()}")
@@ -256,7 +243,7 @@ def claim_rewards() -> Optional[str]:
         tx_hash = web3.eth.send_raw_transaction(signed_tx.rawTransaction)
         
         # Wait for transaction receipt
-        receipt = web3.eth.wait_for_transaction_receipt(tx_hash)
+        receipt = wait_for_receipt(tx_hash)
         
         if receipt.status != 1:
             logger.error(f"Claim rewards transaction failed. Transaction hash: {tx_hash.hex()}")
@@ -345,7 +332,7 @@ def unstake_lp_tokens(amount: int) -> Optional[str]:
         tx_hash = web3.eth.send_raw_transaction(signed_tx.rawTransaction)
         
         # Wait for transaction receipt
-        receipt = web3.eth.wait_for_transaction_receipt(tx_hash)
+        receipt = wait_for_receipt(tx_hash)
         
         if receipt.status != 1:
             logger.error(f"Unstake transaction failed. Transaction hash: {tx_hash.hex()}")
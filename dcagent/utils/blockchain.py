@@ -1,4 +1,8 @@
 from web3 import Web3
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import functools
 import json
 import os
 import time
@@ -31,12 +35,44 @@ except ImportError:
     class TimeExhausted(Exception):
         pass
 
+# Decode JSON-RPC responses with orjson when it is installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from dcagent.config import BASE_RPC_URL, BASE_CHAIN_ID, PRIVATE_KEY
 
 logger = logging.getLogger(__name__)
 
+# Shared HTTP session so all RPC and price API calls reuse pooled keep-alive connections.
+# What the Retry covers, with a short backoff:
+# - connect errors, for every method, as nothing was sent yet;
+# - read errors (e.g. a stale keep-alive connection reset mid-response), only for
+#   idempotent methods: the Coinbase GET is retried, JSON-RPC POSTs are not;
+# - no HTTP status is retried, as no status_forcelist is set.
+# POSTs stay out of the read retries on purpose: web3 sends every call through this
+# session, eth_sendRawTransaction included, and replaying one is the caller's decision
+# (see with_retry and the swap's rebroadcast logic).
+http_adapter = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.2)
+)
+http_session = requests.Session()
+http_session.mount("https://", http_adapter)
+http_session.mount("http://", http_adapter)
+
+class OrjsonHTTPProvider(Web3.HTTPProvider):
+    """HTTPProvider that parses JSON-RPC responses with orjson"""
+
+    def decode_rpc_response(self, raw_response: bytes):
+        # Requests keep web3's own encoder, which knows how to serialise HexBytes/AttributeDicts
+        return orjson.loads(raw_response)
+
 # Initialize web3 connection to Base
-web3 = Web3(Web3.HTTPProvider(BASE_RPC_URL))
+provider_class = OrjsonHTTPProvider if orjson is not None else Web3.HTTPProvider
+web3 = Web3(provider_class(BASE_RPC_URL, session=http_session))
 
 # Add middleware with fallback for different web3.py versions
 try:
@@ -121,8 +157,9 @@ ERC20_ABI = json.loads('''
 ]
 ''')
 
+@functools.lru_cache(maxsize=1)
 def get_account():
-    """Get the account from private key"""
+    """Get the account from private key, derived once per process"""
     return web3.eth.account.from_key(PRIVATE_KEY)
 
 def get_contract(contract_address, abi):
@@ -136,6 +173,85 @@ def get_token_balance(token_address, address):
     decimals = token_contract.functions.decimals().call()
     return balance / (10 ** decimals)
 
+class BatchNotSupported(ValueError):
+    """The node answered a JSON-RPC batch with something other than one reply per request"""
+
+def json_rpc_batch(calls: List[Tuple[str, list]], timeout: float = 10) -> List[Any]:
+    """
+    Send several JSON-RPC requests to the node in one HTTP POST
+    
+    Args:
+        calls: (method, params) pairs
+        timeout: Request timeout in seconds
+        
+    Returns:
+        Raw results in the same order as calls
+        
+    Raises:
+        BatchNotSupported: If the node rejected the batch as a whole
+        ValueError: If the node returned an error for any of the calls
+    """
+    payload = [
+        {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+        for request_id, (method, params) in enumerate(calls)
+    ]
+    response = http_session.post(BASE_RPC_URL, json=payload, timeout=timeout)
+    if 400 <= response.status_code < 500:
+        # Some providers refuse batches at the HTTP level
+        raise BatchNotSupported(f"Batch request rejected with HTTP {response.status_code}")
+    response.raise_for_status()
+    
+    # Providers without batch support answer with a single error object instead of a list
+    replies = response.json()
+    ids = [reply.get("id") for reply in replies if isinstance(reply, dict)] if isinstance(replies, list) else []
+    if len(ids) != len(calls) or any(type(i) is not int for i in ids) or sorted(ids) != list(range(len(calls))):
+        raise BatchNotSupported(f"Unexpected reply to a batch request: {str(replies)[:200]}")
+    
+    # Batch replies may come back in any order
+    replies.sort(key=lambda reply: reply["id"])
+    for reply in replies:
+        if "error" in reply:
+            raise ValueError(f"{calls[reply['id']][0]} failed: {reply['error']}")
+    return [reply["result"] for reply in replies]
+
+# Base produces a block every 2 seconds, so a receipt can't show up any faster.
+# Receipt polls start one block apart and back off from there, which confirms a
+# typical transaction in a handful of eth_getTransactionReceipt calls.
+BLOCK_TIME = 2  # seconds
+RECEIPT_POLL_BACKOFF = 1.2
+RECEIPT_POLL_MAX_INTERVAL = 5  # seconds
+
+def wait_for_receipt(tx_hash, timeout: float = 120):
+    """
+    Wait for a transaction to be mined, polling with backoff from the chain's block cadence
+    
+    Args:
+        tx_hash: Hash of the submitted transaction, or a list of hashes sent under one
+            nonce (a transaction and its fee-bumped replacements)
+        timeout: Seconds to wait before raising TimeExhausted
+        
+    Returns:
+        Transaction receipt of whichever hash was mined
+    """
+    tx_hashes = tx_hash if isinstance(tx_hash, list) else [tx_hash]
+    deadline = time.monotonic() + timeout
+    delay = BLOCK_TIME
+    while True:
+        # Check before the first sleep: a pipelined transaction is often mined already
+        for candidate in tx_hashes:
+            try:
+                receipt = web3.eth.get_transaction_receipt(candidate)
+                if receipt is not None:
+                    return receipt
+            except TransactionNotFound:
+                pass
+        
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeExhausted(f"Transaction {tx_hashes[-1].hex()} is not in the chain after {timeout} seconds")
+        time.sleep(min(delay, remaining))
+        delay = min(delay * RECEIPT_POLL_BACKOFF, RECEIPT_POLL_MAX_INTERVAL)
+
 # Type variable for generic return type
 T = TypeVar('T')
 
@@ -267,7 +383,7 @@ def send_transaction_with_retry(
             
             # Wait for transaction receipt with separate retry logic for waiting
             try:
-                receipt = web3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
+                receipt = wait_for_receipt(tx_hash, timeout=120)
                 logger.info(f"Transaction successful: {tx_hash.hex()}")
                 return receipt
             except TimeExhausted:
@@ -275,7 +391,7 @@ def send_transaction_with_retry(
                 logger.warning(f"Transaction sent but waiting for confirmation timed out: {tx_hash.hex()}")
                 try:
                     # Try once more with a longer timeout
-                    receipt = web3.eth.wait_for_transaction_receipt(tx_hash, timeout=300)
+                    receipt = wait_for_receipt(tx_hash, timeout=300)
                     logger.info(f"Transaction confirmed after extended wait: {tx_hash.hex()}")
                     return receipt
                 except Exception as e:
@@ -350,6 +466,92 @@ def approve_token_spending(token_address, spender_address, amount, gas_price=Non
         
     return receipt
 
+def _submit_tx_params(account, gas_limit, gas_price, nonce, fees) -> Dict[str, Any]:
+    """Transaction fields shared by the submit_* helpers"""
+    tx_params = {
+        'from': account.address,
+        'nonce': nonce if nonce is not None else web3.eth.get_transaction_count(account.address, 'pending'),
+        # Known up front, so build_transaction doesn't ask the node
+        'chainId': BASE_CHAIN_ID,
+    }
+    if fees:
+        tx_params.update(fees)
+    else:
+        tx_params['gasPrice'] = gas_price or web3.eth.gas_price
+    if gas_limit is not None:
+        tx_params['gas'] = gas_limit
+    return tx_params
+
+def submit_contract_transaction(
+    contract_function,
+    account=None,
+    gas_limit=None,
+    gas_price=None,
+    nonce=None,
+    fees=None
+):
+    """
+    Sign and broadcast a contract transaction without waiting for it to be mined
+    
+    Lets callers queue dependent transactions back to back (e.g. an approve and the
+    swap that spends it) under consecutive nonces and wait for confirmation once.
+    
+    Args:
+        contract_function: The contract function to call
+        account: The account to use (defaults to get_account())
+        gas_limit: Gas limit; required when the call can't be estimated yet
+        gas_price: Optional legacy gas price to use
+        nonce: Nonce to use (defaults to the account's pending nonce)
+        fees: Fee fields (e.g. maxFeePerGas/maxPriorityFeePerGas); overrides gas_price
+        
+    Returns:
+        Transaction hash
+    """
+    if account is None:
+        account = get_account()
+    
+    tx_params = _submit_tx_params(account, gas_limit, gas_price, nonce, fees)
+    signed_tx = account.sign_transaction(contract_function.build_transaction(tx_params))
+    tx_hash = web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+    logger.info(f"Submitted {contract_function.fn_name} transaction: {tx_hash.hex()}")
+    return tx_hash
+
+def submit_calldata_transaction(
+    to,
+    data: bytes,
+    gas_limit: int,
+    account=None,
+    gas_price=None,
+    nonce=None,
+    fees=None
+):
+    """
+    Sign and broadcast a call whose calldata is already encoded, without waiting for it to be mined
+    
+    Args:
+        to: Contract address (checksummed)
+        data: ABI-encoded calldata, selector included
+        gas_limit: Gas limit
+        account: The account to use (defaults to get_account())
+        gas_price: Optional legacy gas price to use
+        nonce: Nonce to use (defaults to the account's pending nonce)
+        fees: Fee fields (e.g. maxFeePerGas/maxPriorityFeePerGas); overrides gas_price
+        
+    Returns:
+        Transaction hash
+    """
+    if account is None:
+        account = get_account()
+    
+    tx = _submit_tx_params(account, gas_limit, gas_price, nonce, fees)
+    tx.update({'to': to, 'data': data, 'value': 0})
+    del tx['from']  # implied by the signature
+    
+    signed_tx = account.sign_transaction(tx)
+    tx_hash = web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+    logger.info(f"Submitted transaction to {to}: {tx_hash.hex()}")
+    return tx_hash
+
 def send_contract_transaction(
     contract_function,
     account=None,
@@ -1,11 +1,40 @@
 import logging
 import time
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 from dcagent.utils.claude_advisor import ClaudeAdvisor
 from dcagent.utils.blockchain import web3
 
 logger = logging.getLogger(__name__)
 
+# Blocks sampled by eth_feeHistory and how long its estimate is reused
+FEE_HISTORY_BLOCKS = 5
+FEE_CACHE_TTL = 15  # seconds
+
+# (monotonic fetch time, base fee, priority fee) of the last fee estimate
+_fee_cache: Optional[Tuple[float, int, int]] = None
+
+def get_fee_estimate() -> Tuple[int, int]:
+    """
+    Estimate EIP-1559 fees from a single eth_feeHistory call
+    
+    Returns:
+        Tuple[int, int]: Next block's base fee and the median recent priority fee, in wei
+    """
+    global _fee_cache
+    
+    cached = _fee_cache
+    if cached is not None and time.monotonic() - cached[0] < FEE_CACHE_TTL:
+        return cached[1], cached[2]
+    
+    history = web3.eth.fee_history(FEE_HISTORY_BLOCKS, 'latest', [50])
+    # The last entry is the base fee of the block after 'latest'
+    base_fee = history['baseFeePerGas'][-1]
+    tips = sorted(reward[0] for reward in history['reward'])
+    priority_fee = tips[len(tips) // 2] if tips else 0
+    
+    _fee_cache = (time.monotonic(), base_fee, priority_fee)
+    return base_fee, priority_fee
+
 class GasOptimizer:
     """
     AI-powered gas price optimization for transactions
@@ -51,4 +80,47 @@ class GasOptimizer:
         
         except Exception as e:
             logger.error(f"Error optimizing gas price: {e}, using default gas price")
-            return web3.eth.gas_price
\ No newline at end of file
+            return web3.eth.gas_price
+    
+    def get_optimized_fees(self, strategy: str, amount: float) -> Dict[str, int]:
+        """
+        Get AI-optimized EIP-1559 fee fields for a transaction
+        
+        Args:
+            strategy: Strategy name (dca, dip, etc.)
+            amount: Transaction amount in USD
+            
+        Returns:
+            maxFeePerGas/maxPriorityFeePerGas, or a legacy gasPrice if fee history is unavailable
+        """
+        try:
+            base_fee, priority_fee = get_fee_estimate()
+            current_gas_gwei = web3.from_wei(base_fee + priority_fee, 'gwei')
+            
+            # Get optimization recommendations from Claude
+            optimization = self.claude_advisor.optimize_transaction(
+                strategy, 
+                amount, 
+                current_gas_gwei
+            )
+            
+            if not optimization['proceed']:
+                logger.info(f"AI recommends waiting for better gas prices: {optimization['reasoning']}")
+                # Sleep for 5 minutes and try again
+                time.sleep(300)
+                return self.get_optimized_fees(strategy, amount)
+            
+            # The base fee is set by the protocol, so the adjustment only scales the tip;
+            # doubling the base fee keeps the transaction valid through a few full blocks
+            max_priority_fee = int(priority_fee * optimization['gas_adjustment'])
+            fees = {
+                'maxFeePerGas': 2 * base_fee + max_priority_fee,
+                'maxPriorityFeePerGas': max_priority_fee
+            }
+            
+            logger.info(f"AI optimized priority fee: {web3.from_wei(max_priority_fee, 'gwei')} gwei (adjustment factor: {optimization['gas_adjustment']})")
+            return fees
+        
+        except Exception as e:
+            logger.error(f"Error optimizing EIP-1559 fees: {e}, using default gas price")
+            return {'gasPrice': web3.eth.gas_price}
\ No newline at end of file
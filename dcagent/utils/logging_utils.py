@@ -1,12 +1,118 @@
 import json
 import os
 import logging
+import threading
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List
+
+# Prefer the faster orjson codec for events.json when it is installed
+try:
+    import orjson
+    from orjson import loads as json_loads
+except ImportError:
+    orjson = None
+    from json import loads as json_loads
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Newline-delimited JSON: one event per line, only ever appended to
+EVENTS_FILE = "events.json"
+
+# Once events.json would grow past this, it is moved to its ".1" archive (replacing
+# the previous one) and a fresh file is started, so readers parse a bounded amount
+EVENTS_MAX_BYTES = 4 * 1024 * 1024
+
+# Strategies log from worker threads; rotating and appending must not interleave
+_events_lock = threading.Lock()
+
+# Bytes read per step when scanning events.json backwards from its end
+TAIL_BLOCK_SIZE = 64 * 1024
+
+def _encode_event(event: Dict[str, Any]) -> bytes:
+    """Serialise an event as one events.json line"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(event) + b"\n"
+        except TypeError:
+            # orjson rejects ints wider than 64 bits; the stdlib encoder doesn't
+            pass
+    return json.dumps(event).encode() + b"\n"
+
+def _parse_event_line(line: bytes) -> List[Dict[str, Any]]:
+    """Events on one line of events.json; a file from before NDJSON is a single array line"""
+    if not line.strip():
+        return []
+    try:
+        parsed = json_loads(line)
+    except ValueError:
+        # A line torn by an interrupted write
+        return []
+    return parsed if isinstance(parsed, list) else [parsed]
+
+def _archive_path(path: str) -> str:
+    """Where an events file is moved when it is rotated"""
+    return path + ".1"
+
+def _read_forwards(path: str) -> Iterator[Dict[str, Any]]:
+    """Events in one file, oldest first; empty if the file doesn't exist"""
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return
+    with f:
+        for line in f:
+            yield from _parse_event_line(line)
+
+def read_events(path: str = EVENTS_FILE) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the events in events.json and its archive, oldest first
+    
+    Args:
+        path: Events file to read
+        
+    Returns:
+        Iterator of events; empty if the file doesn't exist
+    """
+    yield from _read_forwards(_archive_path(path))
+    yield from _read_forwards(path)
+
+def _read_backwards(path: str) -> Iterator[Dict[str, Any]]:
+    """Events in one file, newest first; empty if the file doesn't exist"""
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return
+    with f:
+        pos = f.seek(0, os.SEEK_END)
+        partial = b""
+        while pos > 0:
+            step = min(TAIL_BLOCK_SIZE, pos)
+            pos -= step
+            f.seek(pos)
+            lines = (f.read(step) + partial).split(b"\n")
+            # The first piece may continue in the block before this one
+            partial = lines.pop(0)
+            for line in reversed(lines):
+                yield from reversed(_parse_event_line(line))
+        yield from reversed(_parse_event_line(partial))
+
+def read_events_newest_first(path: str = EVENTS_FILE) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the events in events.json and its archive, newest first
+    
+    Files are read backwards a block at a time, so a caller that stops
+    after a few events only reads and parses the end of events.json.
+    
+    Args:
+        path: Events file to read
+        
+    Returns:
+        Iterator of events; empty if the file doesn't exist
+    """
+    yield from _read_backwards(path)
+    yield from _read_backwards(_archive_path(path))
+
 def log_event(event_type: str, data: Dict[str, Any]) -> None:
     """
     Log an event to the events.json file for the dashboard
@@ -21,23 +127,25 @@ def log_event(event_type: str, data: Dict[str, Any]) -> None:
         "data": data
     }
     
-    events_file = "events.json"
-    events = []
-    
-    # Read existing events
-    if os.path.exists(events_file):
-        with open(events_file, "r") as f:
-            try:
-                events = json.load(f)
-            except json.JSONDecodeError:
-                events = []
+    line = _encode_event(event)
     
-    # Add new event
-    events.append(event)
-    
-    # Write events back to file (keep only last 100)
-    with open(events_file, "w") as f:
-        json.dump(events[-100:], f)
+    with _events_lock:
+        # Rotate a full file out of the way rather than letting it grow without bound
+        try:
+            if os.path.getsize(EVENTS_FILE) + len(line) > EVENTS_MAX_BYTES:
+                os.replace(EVENTS_FILE, _archive_path(EVENTS_FILE))
+        except FileNotFoundError:
+            pass
+        
+        # Append the event as one line instead of rewriting the whole file
+        with open(EVENTS_FILE, "a+b") as f:
+            end = f.seek(0, os.SEEK_END)
+            if end:
+                # Start a fresh line if the file doesn't end with one (an old JSON array, or a torn write)
+                f.seek(end - 1)
+                if f.read(1) != b"\n":
+                    line = b"\n" + line
+            f.write(line)
     
     logger.info(f"Logged {event_type} event: {data}")
 
@@ -86,30 +194,13 @@ def get_recent_transactions(limit: int = 10, tx_type: str = None) -> List[Dict[s
     Returns:
         List of transaction events
     """
-    events_file = "events.json"
-    
-    if not os.path.exists(events_file):
-        return []
-    
-    try:
-        with open(events_file, "r") as f:
-            events = json.load(f)
-    except (json.JSONDecodeError, IOError):
-        return []
-    
-    # Filter for transaction events
+    # Filter for transaction events, by transaction type if specified
     transactions = [
-        event for event in events 
+        event for event in read_events()
         if event.get("type") == "transaction"
+        and (not tx_type or event.get("data", {}).get("type") == tx_type)
     ]
     
-    # Filter by transaction type if specified
-    if tx_type:
-        transactions = [
-            tx for tx in transactions 
-            if tx.get("data", {}).get("type") == tx_type
-        ]
-    
     # Sort by timestamp (newest first)
     transactions.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
     
@@ -126,20 +217,12 @@ def get_strategy_stats(strategy_name: str) -> Dict[str, Any]:
     Returns:
         Dictionary with strategy statistics
     """
-    events_file = "events.json"
-    
-    if not os.path.exists(events_file):
-        return {}
-    
-    try:
-        with open(events_file, "r") as f:
-            events = json.load(f)
-    except (json.JSONDecodeError, IOError):
+    if not os.path.exists(EVENTS_FILE) and not os.path.exists(_archive_path(EVENTS_FILE)):
         return {}
     
     # Filter events for this strategy
     strategy_events = [
-        event for event in events 
+        event for event in read_events()
         if event.get("data", {}).get("strategy") == strategy_name
     ]
     
@@ -0,0 +1,127 @@
+import logging
+from typing import List, NamedTuple, Optional, Tuple
+
+# eth-abi renamed decode_abi to decode in v4
+try:
+    from eth_abi import decode as decode_abi
+except ImportError:
+    from eth_abi import decode_abi
+
+from dcagent.config import CBBTC_GAUGE as GAUGE_ADDRESS
+from dcagent.utils.abi_cache import load_abi
+from dcagent.utils.blockchain import web3, get_account, get_contract, json_rpc_batch, BatchNotSupported, ERC20_ABI
+from dcagent.utils.aerodrome import GAUGE_ABI, LP_TOKEN_DECIMALS
+
+logger = logging.getLogger(__name__)
+
+# Multicall3 is deployed at the same address on Base and most EVM chains
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+MULTICALL3_ABI = load_abi('multicall3.json')
+
+class YieldSnapshot(NamedTuple):
+    """Staked LP and earned AERO balances read in a single RPC round trip"""
+    staked: float
+    earned: float
+
+class AllowanceSnapshot(NamedTuple):
+    """Token balance and allowance, in raw token units, read in a single RPC round trip"""
+    balance: int
+    allowance: int
+
+def aggregate(calls: List[Tuple[str, str]]) -> List[Optional[bytes]]:
+    """
+    Run several view calls as one eth_call through Multicall3
+
+    Args:
+        calls: (target address, ABI-encoded call data) pairs
+
+    Returns:
+        Raw return data per call, or None for calls that reverted
+    """
+    multicall = get_contract(MULTICALL3_ADDRESS, MULTICALL3_ABI)
+    results = multicall.functions.aggregate3([(target, True, data) for target, data in calls]).call()
+    return [data if success else None for success, data in results]
+
+def _decode_uint(data: Optional[bytes]) -> int:
+    """Decode a single uint256 return value"""
+    if not data:
+        raise ValueError("call reverted")
+    return int.from_bytes(data[:32], "big")
+
+def get_yield_snapshot() -> YieldSnapshot:
+    """
+    Get the staked LP balance and earned rewards from the gauge in one request
+
+    Returns:
+        YieldSnapshot, with zeros if the read failed
+    """
+    try:
+        account = get_account()
+        gauge_contract = get_contract(GAUGE_ADDRESS, GAUGE_ABI)
+
+        staked_data, earned_data = aggregate([
+            (GAUGE_ADDRESS, gauge_contract.encodeABI(fn_name="balanceOf", args=[account.address])),
+            (GAUGE_ADDRESS, gauge_contract.encodeABI(fn_name="earned", args=[account.address])),
+        ])
+
+        return YieldSnapshot(
+            staked=_decode_uint(staked_data) / (10**LP_TOKEN_DECIMALS),
+            earned=_decode_uint(earned_data) / (10**18)  # AERO token has 18 decimals
+        )
+
+    except Exception as e:
+        logger.error(f"Error getting yield snapshot: {e}")
+        return YieldSnapshot(staked=0, earned=0)
+
+def _allowance_calls(token_address: str, owner: str, spender: str) -> List[Tuple[str, str]]:
+    """balanceOf and allowance calls for an AllowanceSnapshot"""
+    token_contract = get_contract(token_address, ERC20_ABI)
+    return [
+        (token_address, token_contract.encodeABI(fn_name="balanceOf", args=[owner])),
+        (token_address, token_contract.encodeABI(fn_name="allowance", args=[owner, spender])),
+    ]
+
+def get_allowance_snapshot_and_nonce(token_address: str, owner: str, spender: str) -> Tuple[AllowanceSnapshot, int]:
+    """
+    Get an AllowanceSnapshot and the owner's pending nonce in one HTTP request
+    
+    The Multicall3 eth_call and eth_getTransactionCount go out as a single JSON-RPC batch.
+    On a node that doesn't accept batches they are sent as two ordinary calls instead.
+    
+    Args:
+        token_address: ERC20 token contract address
+        owner: Address holding the tokens, and sending the next transaction
+        spender: Address the allowance is granted to
+        
+    Returns:
+        Tuple[AllowanceSnapshot, int]: Balance/allowance in raw token units, and the next nonce
+        
+    Raises:
+        ValueError: If the node rejected either request or a read reverted
+    """
+    multicall = get_contract(MULTICALL3_ADDRESS, MULTICALL3_ABI)
+    calldata = multicall.encodeABI(
+        fn_name="aggregate3",
+        args=[[(target, True, data) for target, data in _allowance_calls(token_address, owner, spender)]]
+    )
+    
+    try:
+        call_hex, nonce_hex = json_rpc_batch([
+            ("eth_call", [{"to": MULTICALL3_ADDRESS, "data": calldata}, "latest"]),
+            ("eth_getTransactionCount", [owner, "pending"]),
+        ])
+        call_result, nonce = bytes.fromhex(call_hex[2:]), int(nonce_hex, 16)
+    except BatchNotSupported as e:
+        logger.warning(f"JSON-RPC batch not supported ({e}), reading balance and nonce separately")
+        call_result = bytes(web3.eth.call({"to": MULTICALL3_ADDRESS, "data": calldata}, "latest"))
+        nonce = web3.eth.get_transaction_count(owner, "pending")
+    
+    (results,) = decode_abi(["(bool,bytes)[]"], call_result)
+    balance_data, allowance_data = [data if success else None for success, data in results]
+    
+    snapshot = AllowanceSnapshot(
+        balance=_decode_uint(balance_data),
+        allowance=_decode_uint(allowance_data)
+    )
+    return snapshot, nonce
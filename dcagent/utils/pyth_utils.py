@@ -1,12 +1,12 @@
 import json
 import logging
-import requests
-from typing import Optional, Tuple
+import time
+from typing import NamedTuple, Optional, Tuple
 
 from web3 import Web3
 
 from dcagent.config import PYTH_BTC_PRICE_FEED
-from dcagent.utils.blockchain import web3
+from dcagent.utils.blockchain import web3, http_session
 
 logger = logging.getLogger(__name__)
 
@@ -63,6 +63,21 @@ PYTH_CONTRACT_ADDRESS = "0x2880dC247b3c3b05a464fB03Bf2310A39FC1F05A"  # Base Mai
 # Coinbase API endpoint for BTC price
 COINBASE_BTC_PRICE_URL = "https://api.coinbase.com/v2/prices/BTC-USD/spot"
 
+# Coinbase publishes no confidence interval, so its quotes carry this placeholder (0.5% of price)
+COINBASE_CONFIDENCE = 0.005
+
+class PriceQuote(NamedTuple):
+    """BTC/USD price, its confidence interval, and where it came from"""
+    price: float
+    confidence: float
+    source: str  # "coinbase" (placeholder confidence) or "pyth" (published confidence)
+
+# How long a fetched BTC price is reused before hitting the network again
+PRICE_CACHE_TTL = 15  # seconds
+
+# (monotonic fetch time, quote) of the last successful get_price_quote()
+_price_cache: Optional[Tuple[float, PriceQuote]] = None
+
 def get_btc_price_from_coinbase() -> Optional[float]:
     """
     Get the current BTC/USD price from Coinbase API
@@ -71,7 +86,7 @@ def get_btc_price_from_coinbase() -> Optional[float]:
         float: The current BTC price in USD, or None if there was an error
     """
     try:
-        response = requests.get(COINBASE_BTC_PRICE_URL, timeout=5)
+        response = http_session.get(COINBASE_BTC_PRICE_URL, timeout=5)
         response.raise_for_status()  # Raise exception for 4XX/5XX responses
         
         data = response.json()
@@ -86,32 +101,42 @@ def get_btc_price_from_coinbase() -> Optional[float]:
         logger.error(f"Error fetching BTC price from Coinbase: {e}")
         return None
 
+def _read_pyth_quote() -> PriceQuote:
+    """
+    Read the BTC/USD price and its published confidence from the Pyth contract
+    
+    Raises:
+        Exception: Whatever the contract call raised
+    """
+    pyth_contract = web3.eth.contract(
+        address=Web3.to_checksum_address(PYTH_CONTRACT_ADDRESS),
+        abi=PYTH_PRICE_FEED_ABI
+    )
+    
+    # Call the price feed to get latest BTC/USD price
+    price_data = pyth_contract.functions.getPriceUnsafe(PYTH_BTC_PRICE_FEED).call()
+    
+    # Extract price components
+    price = price_data[0]  # price field
+    conf = price_data[1]   # confidence field
+    expo = price_data[2]   # exponent field
+    
+    # Pyth prices are stored as fixed-point numbers, need to adjust by exponent
+    # The exponent is typically negative, like -8 for BTC/USD
+    adjusted_price = price * (10 ** expo)
+    adjusted_conf = conf * (10 ** expo)
+    
+    return PriceQuote(float(adjusted_price), float(adjusted_conf), "pyth")
+
 def get_btc_price_from_pyth() -> Optional[float]:
     """
-    Get the current BTC/USD price from Pyth on-chain
+    Get the current BTC/USD price from Pyth on-chain, bypassing the price cache
     
     Returns:
         float: The current BTC price in USD, or None if there was an error
     """
     try:
-        pyth_contract = web3.eth.contract(
-            address=Web3.to_checksum_address(PYTH_CONTRACT_ADDRESS),
-            abi=PYTH_PRICE_FEED_ABI
-        )
-        
-        # Call the price feed to get latest BTC/USD price
-        price_data = pyth_contract.functions.getPriceUnsafe(PYTH_BTC_PRICE_FEED).call()
-        
-        # Extract and format the price
-        price = price_data[0]  # price field
-        expo = price_data[2]   # exponent field
-        
-        # Pyth prices are stored as fixed-point numbers, need to adjust by exponent
-        # The exponent is typically negative, like -8 for BTC/USD
-        adjusted_price = price * (10 ** expo)
-        
-        return float(adjusted_price)
-        
+        return _read_pyth_quote().price
     except Exception as e:
         logger.error(f"Error fetching BTC price from Pyth: {e}")
         return None
@@ -123,59 +148,62 @@ def get_btc_price() -> Optional[float]:
     Returns:
         float: The current BTC price in USD, or None if both sources failed
     """
-    # Try Coinbase first
-    price = get_btc_price_from_coinbase()
-    if price is not None:
-        logger.info(f"Got BTC price from Coinbase: ${price:,.2f}")
-        return price
-        
-    # Fall back to Pyth if Coinbase fails
-    logger.warning("Failed to get price from Coinbase, trying Pyth...")
-    price = get_btc_price_from_pyth()
-    if price is not None:
-        logger.info(f"Got BTC price from Pyth: ${price:,.2f}")
-        return price
-        
-    # Both sources failed
-    logger.error("Failed to get BTC price from both Coinbase and Pyth")
-    return None
+    quote = get_price_quote()
+    if quote is None:
+        return None
+    return quote.price
 
-def get_price_with_confidence() -> Optional[Tuple[float, float]]:
+def get_price_quote() -> Optional[PriceQuote]:
     """
-    Get the current BTC/USD price and confidence interval
+    Get the current BTC/USD price with its confidence interval and source
+    
+    Coinbase is tried first; its confidence is the COINBASE_CONFIDENCE placeholder.
+    Pyth is the fallback and publishes a real confidence interval.
+    
+    Quotes are reused for PRICE_CACHE_TTL seconds, so back-to-back callers
+    (e.g. a strategy's should_execute() then execute(), or the DCA and dip
+    strategies polling together) share one fetch. get_btc_price() reads the
+    same cache.
     
     Returns:
-        Tuple[float, float]: The current BTC price in USD and confidence, or None if there was an error
+        PriceQuote, or None if both sources failed
     """
+    global _price_cache
+    
+    cached = _price_cache
+    if cached is not None and time.monotonic() - cached[0] < PRICE_CACHE_TTL:
+        return cached[1]
+    
+    quote = _fetch_price_quote()
+    if quote is not None:
+        logger.info(f"Got BTC price from {quote.source.capitalize()}: ${quote.price:,.2f}")
+        _price_cache = (time.monotonic(), quote)
+    return quote
+
+def _fetch_price_quote() -> Optional[PriceQuote]:
+    """Fetch a PriceQuote from Coinbase, falling back to Pyth, bypassing the cache"""
     # First try to get price from Coinbase
     price = get_btc_price_from_coinbase()
     if price is not None:
         # For Coinbase, we don't have a confidence interval, so use a default
-        # Let's use 0.5% as a reasonable confidence value
-        confidence = price * 0.005
-        return (price, confidence)
+        return PriceQuote(price, price * COINBASE_CONFIDENCE, "coinbase")
     
     # Fall back to Pyth which provides confidence
+    logger.warning("Failed to get price from Coinbase, trying Pyth...")
     try:
-        pyth_contract = web3.eth.contract(
-            address=Web3.to_checksum_address(PYTH_CONTRACT_ADDRESS), 
-            abi=PYTH_PRICE_FEED_ABI
-        )
-        
-        # Call the price feed to get latest BTC/USD price
-        price_data = pyth_contract.functions.getPriceUnsafe(PYTH_BTC_PRICE_FEED).call()
-        
-        # Extract price components
-        price = price_data[0]  # price field
-        conf = price_data[1]   # confidence field
-        expo = price_data[2]   # exponent field
-        
-        # Pyth prices are stored as fixed-point numbers, need to adjust by exponent
-        adjusted_price = price * (10 ** expo)
-        adjusted_conf = conf * (10 ** expo)
-        
-        return (float(adjusted_price), float(adjusted_conf))
-        
+        return _read_pyth_quote()
     except Exception as e:
-        logger.error(f"Error fetching BTC price with confidence: {e}")
-        return None
\ No newline at end of file
+        logger.error(f"Failed to get BTC price from both Coinbase and Pyth: {e}")
+        return None
+
+def get_price_with_confidence() -> Optional[Tuple[float, float]]:
+    """
+    Get the current BTC/USD price and confidence interval
+    
+    Returns:
+        Tuple[float, float]: The current BTC price in USD and confidence, or None if there was an error
+    """
+    quote = get_price_quote()
+    if quote is None:
+        return None
+    return (quote.price, quote.confidence)
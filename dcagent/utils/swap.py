@@ -0,0 +1,315 @@
+import functools
+import logging
+import time
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from hexbytes import HexBytes
+from web3 import Web3
+
+from dcagent.config import DCA_AMOUNT, CBBTC_CONTRACT_ADDRESS, USDC_CONTRACT_ADDRESS, AERODROME_ROUTER
+from dcagent.utils.abi_cache import load_abi
+from dcagent.utils.blockchain import (
+    web3,
+    get_contract,
+    submit_contract_transaction,
+    submit_calldata_transaction,
+    wait_for_receipt,
+    ERC20_ABI,
+    RETRY_ERRORS,
+    TimeExhausted
+)
+
+logger = logging.getLogger(__name__)
+
+# Checksummed once at import rather than on every swap
+AERODROME_FACTORY = Web3.to_checksum_address("0xAAA20D08e59F6561f242b08513D36266C5A29415")
+ROUTER_ADDRESS = Web3.to_checksum_address(AERODROME_ROUTER)
+CBBTC_ADDRESS = Web3.to_checksum_address(CBBTC_CONTRACT_ADDRESS)
+
+# The single-hop USDC -> cbBTC route every buy takes
+SWAP_ROUTES = [{
+    "from": USDC_CONTRACT_ADDRESS,           # tokenIn
+    "to": CBBTC_CONTRACT_ADDRESS,            # tokenOut
+    "stable": False,                         # volatile pair
+    "factory": AERODROME_FACTORY             # Aerodrome factory
+}]
+
+# topic0 of the ERC20 Transfer event, which carries the cbBTC a swap paid out
+TRANSFER_TOPIC = Web3.keccak(text="Transfer(address,address,uint256)")
+
+# Byte ranges of the per-swap words in swapExactTokensForTokens calldata. The route
+# array's offset and contents live after the head, so these never move.
+_WORD = 32
+_AMOUNT_IN = slice(4, 4 + _WORD)
+_AMOUNT_OUT_MIN = slice(4 + _WORD, 4 + 2 * _WORD)
+_DEADLINE = slice(4 + 4 * _WORD, 4 + 5 * _WORD)
+
+# Explicit gas limits; the swap can't be estimated while its approve is still pending
+APPROVE_GAS_LIMIT = 60000
+SWAP_GAS_LIMIT = 300000
+
+# How long to wait for the approve and swap to be mined
+RECEIPT_TIMEOUT = 120  # seconds
+# How long a swap stays valid once signed
+SWAP_DEADLINE = 600  # seconds
+
+# Default retry policy: how many times a rejected or unmined transaction is re-signed,
+# and how much its fees are raised each time. Replacements need at least a 10% bump.
+SWAP_MAX_RETRIES = 3
+GAS_PRICE_BUMP_PERCENT = 10
+
+USDC_DECIMALS = 6  # USDC has 6 decimals
+CBBTC_DECIMALS = 18  # cbBTC has 18 decimals (like most ERC20 tokens)
+USDC_SCALE = 10**USDC_DECIMALS
+CBBTC_SCALE = 10**CBBTC_DECIMALS
+
+# Slippage is passed around in basis points so amountOutMin is pure integer math
+BPS = 10000
+
+# The configured buy size in USDC wei, converted once and exactly
+USDC_AMOUNT_WEI = int(Decimal(str(DCA_AMOUNT)) * USDC_SCALE)
+
+# When the router's USDC allowance runs low, approve enough for this many buys.
+# Bounded rather than unlimited so the router can never pull more than that.
+ALLOWANCE_RUNS = 100
+
+class ApprovalFailed(Exception):
+    """The router approve reverted after the swap was already broadcast behind it"""
+
+    def __init__(self, approve_hash, swap_hash):
+        self.approve_hash = approve_hash
+        self.swap_hash = swap_hash
+        super().__init__(
+            f"USDC approval {approve_hash.hex()} failed; swap {swap_hash.hex()} "
+            "is expected to revert on the missing allowance"
+        )
+
+@functools.lru_cache(maxsize=None)
+def router_contract():
+    """Aerodrome Router contract wrapper, built once per process"""
+    return get_contract(AERODROME_ROUTER, load_abi('router.json'))
+
+@functools.lru_cache(maxsize=None)
+def _swap_calldata_template(recipient: str) -> bytes:
+    """swapExactTokensForTokens calldata along SWAP_ROUTES to recipient, with zeroed amounts and deadline"""
+    data = router_contract().encodeABI(fn_name="swapExactTokensForTokens", args=[0, 0, SWAP_ROUTES, recipient, 0])
+    return bytes.fromhex(data[2:])
+
+def swap_calldata(recipient: str, amount_in: int, amount_out_min: int, deadline: int) -> bytes:
+    """
+    Encode a swap by writing the per-swap values into the cached calldata template
+
+    Args:
+        recipient: Address receiving the cbBTC
+        amount_in: USDC to sell, in wei
+        amount_out_min: Minimum cbBTC to receive, in wei
+        deadline: POSIX timestamp after which the swap reverts
+
+    Returns:
+        Calldata for the router
+    """
+    calldata = bytearray(_swap_calldata_template(recipient))
+    calldata[_AMOUNT_IN] = amount_in.to_bytes(_WORD, "big")
+    calldata[_AMOUNT_OUT_MIN] = amount_out_min.to_bytes(_WORD, "big")
+    calldata[_DEADLINE] = deadline.to_bytes(_WORD, "big")
+    return bytes(calldata)
+
+def min_cbbtc_out(usdc_amount_wei: int, btc_price: float, slippage_bps: int) -> int:
+    """
+    Minimum cbBTC to accept for a swap, without float rounding
+
+    Args:
+        usdc_amount_wei: USDC to sell, in wei
+        btc_price: BTC price in USD
+        slippage_bps: Allowed slippage, in basis points
+
+    Returns:
+        amountOutMin in cbBTC wei, rounded down
+    """
+    price_wei = int(Decimal(str(btc_price)) * USDC_SCALE)  # USDC wei per whole BTC
+    btc_amount_wei = usdc_amount_wei * CBBTC_SCALE // price_wei
+    return btc_amount_wei * (BPS - slippage_bps) // BPS
+
+def _bump_fees(fees: Dict[str, int], bump_percent: int) -> Dict[str, int]:
+    """Raise every fee field by bump_percent, rounding up so a replacement clears the node's minimum bump"""
+    return {field: value * (100 + bump_percent) // 100 + 1 for field, value in fees.items()}
+
+def _broadcast(
+    send: Callable[[int, Dict[str, int]], Any],
+    account,
+    nonce: int,
+    fees: Dict[str, int],
+    max_retries: int,
+    bump_percent: int
+) -> Tuple[Any, int, Dict[str, int]]:
+    """
+    Broadcast send(nonce, fees), re-signing with bumped fees when the node rejects it
+
+    Returns:
+        Tuple of the transaction hash and the nonce and fees it was finally sent with
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return send(nonce, fees), nonce, fees
+        except Exception as e:
+            error_message = str(e).lower()
+            if attempt >= max_retries or not any(err in error_message for err in RETRY_ERRORS):
+                raise
+            logger.warning("Transaction rejected: %s. Retrying with fees bumped %s%%", e, bump_percent)
+            if "nonce" in error_message:
+                nonce = web3.eth.get_transaction_count(account.address, 'pending')
+            fees = _bump_fees(fees, bump_percent)
+            time.sleep(2 ** attempt)
+
+def _confirm(
+    tx_hash,
+    send: Callable[[int, Dict[str, int]], Any],
+    nonce: int,
+    fees: Dict[str, int],
+    max_retries: int,
+    bump_percent: int
+):
+    """
+    Wait for a transaction, replacing it under the same nonce with bumped fees while it isn't mined
+
+    Returns:
+        Receipt of whichever copy of the transaction was mined
+    """
+    tx_hashes: List[Any] = [tx_hash]
+    for attempt in range(max_retries + 1):
+        try:
+            return wait_for_receipt(tx_hashes, timeout=RECEIPT_TIMEOUT)
+        except TimeExhausted:
+            if attempt >= max_retries:
+                raise
+        fees = _bump_fees(fees, bump_percent)
+        logger.warning("Transaction %s not mined after %ss, replacing it with fees bumped %s%%",
+                       tx_hashes[-1].hex(), RECEIPT_TIMEOUT, bump_percent)
+        try:
+            tx_hashes.append(send(nonce, fees))
+        except Exception as e:
+            # Typically "nonce too low": an earlier copy was mined in the meantime,
+            # which the next wait picks up
+            logger.warning("Replacement not sent: %s", e)
+
+def swap_usdc_to_cbbtc(
+    account,
+    usdc_amount_wei: int,
+    min_btc_amount_wei: int,
+    allowance: int,
+    nonce: int,
+    fees: Optional[Dict[str, int]] = None,
+    max_retries: int = SWAP_MAX_RETRIES,
+    gas_price_bump_percent: int = GAS_PRICE_BUMP_PERCENT
+) -> Optional[Any]:
+    """
+    Swap USDC for cbBTC through the Aerodrome Router, approving the router first if needed
+
+    An EOA can't make approve+swap atomic, so both are sent back to back under
+    consecutive nonces and confirmation is awaited once instead of twice. The
+    approve receipt is checked before the swap is waited on; if the approve
+    failed, ApprovalFailed is raised, as the swap will revert on the missing allowance.
+
+    Each transaction the node rejects with a retryable error (underpriced, nonce
+    too low, ...) is re-signed with fees bumped by gas_price_bump_percent, and one
+    that isn't mined within RECEIPT_TIMEOUT is replaced under the same nonce the
+    same way, up to max_retries times. A swap that is mined but reverts is not retried.
+
+    Args:
+        account: Account sending both transactions and receiving the cbBTC
+        usdc_amount_wei: USDC to sell, in wei
+        min_btc_amount_wei: Minimum cbBTC to receive, in wei
+        allowance: The router's current USDC allowance from account, in wei
+        nonce: account's next nonce
+        fees: EIP-1559 or legacy fee fields; defaults to the node's gas price
+        max_retries: Re-signs allowed per transaction
+        gas_price_bump_percent: Fee increase per re-sign, in percent
+
+    Returns:
+        The swap receipt, or None if the swap failed
+
+    Raises:
+        ApprovalFailed: If the approve reverted, leaving the swap to revert too
+    """
+    if not fees:
+        fees = {'gasPrice': web3.eth.gas_price}
+
+    approve_hash = None
+    if allowance < usdc_amount_wei:
+        usdc_contract = get_contract(USDC_CONTRACT_ADDRESS, ERC20_ABI)
+        approve_amount = usdc_amount_wei * ALLOWANCE_RUNS
+        approve_function = usdc_contract.functions.approve(ROUTER_ADDRESS, approve_amount)
+
+        def send_approve(tx_nonce: int, tx_fees: Dict[str, int]):
+            return submit_contract_transaction(
+                approve_function,
+                account=account,
+                gas_limit=APPROVE_GAS_LIMIT,
+                fees=tx_fees,
+                nonce=tx_nonce
+            )
+
+        logger.info("Approving Aerodrome Router to spend %s USDC", approve_amount / USDC_SCALE)
+        approve_hash, approve_nonce, approve_fees = _broadcast(
+            send_approve, account, nonce, fees, max_retries, gas_price_bump_percent
+        )
+        nonce = approve_nonce + 1
+    else:
+        logger.info("Existing USDC allowance covers this swap, skipping approval")
+
+    # Only the amounts and deadline change between swaps, so they are spliced
+    # into pre-encoded calldata instead of ABI-encoding the whole call
+    deadline = int(time.time() + SWAP_DEADLINE)
+    swap_data = swap_calldata(account.address, usdc_amount_wei, min_btc_amount_wei, deadline)
+
+    def send_swap(tx_nonce: int, tx_fees: Dict[str, int]):
+        return submit_calldata_transaction(
+            ROUTER_ADDRESS,
+            swap_data,
+            gas_limit=SWAP_GAS_LIMIT,
+            account=account,
+            fees=tx_fees,
+            nonce=tx_nonce
+        )
+
+    swap_hash, swap_nonce, swap_fees = _broadcast(
+        send_swap, account, nonce, fees, max_retries, gas_price_bump_percent
+    )
+
+    if approve_hash is not None:
+        approve_receipt = _confirm(
+            approve_hash, send_approve, approve_nonce, approve_fees, max_retries, gas_price_bump_percent
+        )
+        if approve_receipt.status != 1:
+            raise ApprovalFailed(approve_receipt.transactionHash, swap_hash)
+
+    receipt = _confirm(swap_hash, send_swap, swap_nonce, swap_fees, max_retries, gas_price_bump_percent)
+    if not receipt or receipt.status != 1:
+        logger.error("Swap transaction failed. Receipt: %s", receipt)
+        return None
+
+    return receipt
+
+def received_cbbtc(receipt, recipient: str) -> Optional[int]:
+    """
+    Read the cbBTC a swap paid out from its receipt, instead of querying the balance
+
+    Args:
+        receipt: Receipt of a successful swap
+        recipient: Address the cbBTC was sent to
+
+    Returns:
+        cbBTC received, in wei, or None if the receipt has no matching Transfer
+    """
+    recipient_topic = HexBytes(recipient).rjust(_WORD, b"\0")
+    for log in receipt.logs:
+        topics = log["topics"]
+        if (
+            log["address"] == CBBTC_ADDRESS
+            and len(topics) == 3
+            and topics[0] == TRANSFER_TOPIC
+            and topics[2] == recipient_topic
+        ):
+            return int.from_bytes(HexBytes(log["data"]), "big")
+    return None
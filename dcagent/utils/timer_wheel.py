@@ -0,0 +1,105 @@
+import math
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+class TimerWheel:
+    """
+    Hashed timer wheel keyed on absolute deadlines, in seconds on the caller's clock
+    (DCAgent uses time.monotonic())
+
+    Entries stay in the slot their deadline hashes to and poll() checks the exact
+    deadline, so nothing cascades between levels and scheduling is O(1).
+    """
+
+    def __init__(self, slots: int = 1024, tick: float = 1.0):
+        if slots & (slots - 1):
+            raise ValueError("slots must be a power of two")
+        self.tick = tick
+        self._mask = slots - 1
+        self._slots: List[List[Tuple[float, Any]]] = [[] for _ in range(slots)]
+        self._occupied: Set[int] = set()
+        self._index: Dict[int, int] = {}  # id(item) -> slot
+        self._last_tick: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _tick_of(self, when: float) -> int:
+        return math.floor(when / self.tick)
+
+    def schedule(self, deadline: float, item: Any) -> None:
+        """
+        Schedule an item, replacing any deadline it already has
+
+        Args:
+            deadline: Time at which the item becomes due
+            item: Object handed back by poll() once due
+        """
+        self.cancel(item)
+        tick = self._tick_of(deadline)
+        if self._last_tick is not None:
+            # Overdue items go in the current slot so the next poll still visits them
+            tick = max(tick, self._last_tick)
+        slot = tick & self._mask
+        self._slots[slot].append((deadline, item))
+        self._occupied.add(slot)
+        self._index[id(item)] = slot
+
+    def cancel(self, item: Any) -> bool:
+        """
+        Remove an item from the wheel
+
+        Returns:
+            bool: True if the item was scheduled
+        """
+        slot = self._index.pop(id(item), None)
+        if slot is None:
+            return False
+        self._slots[slot] = [entry for entry in self._slots[slot] if entry[1] is not item]
+        if not self._slots[slot]:
+            self._occupied.discard(slot)
+        return True
+
+    def next_deadline(self) -> Optional[float]:
+        """Earliest scheduled deadline, or None if the wheel is empty"""
+        if not self._occupied:
+            return None
+        return min(deadline for slot in self._occupied for deadline, _ in self._slots[slot])
+
+    def poll(self, now: float) -> List[Any]:
+        """
+        Remove and return every item whose deadline has passed
+
+        Only the slots for ticks elapsed since the previous poll are visited, or
+        every occupied slot when a full rotation (or more) has gone by.
+
+        Args:
+            now: Current time, on the clock the deadlines use
+
+        Returns:
+            List of due items, earliest deadline first
+        """
+        current = self._tick_of(now)
+        if self._last_tick is None or current - self._last_tick > self._mask:
+            slots = list(self._occupied)
+        else:
+            slots = [t & self._mask for t in range(self._last_tick, current + 1)]
+        self._last_tick = current
+
+        due: List[Tuple[float, Any]] = []
+        for slot in slots:
+            entries = self._slots[slot]
+            if not entries:
+                continue
+            keep = []
+            for entry in entries:
+                if entry[0] <= now:
+                    due.append(entry)
+                    del self._index[id(entry[1])]
+                else:
+                    keep.append(entry)
+            self._slots[slot] = keep
+            if not keep:
+                self._occupied.discard(slot)
+
+        due.sort(key=lambda entry: entry[0])
+        return [item for _, item in due]